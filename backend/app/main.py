@@ -15,17 +15,27 @@ import os
 env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-
-print("your_api_key_here=", os.getenv("your_api_key_here"))
-
+import asyncio
 import tempfile
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timezone
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Optional, Tuple
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-import json
+import orjson
 import uvicorn
 
 from app.services.transcribe import ArollTranscriber
@@ -34,22 +44,235 @@ from app.services.matcher import SemanticMatcher
 from app.services.timeline import TimelinePlanner
 
 
+# Logging: the app's records are handed to a queue and written by a
+# background listener thread, so request handlers never block on stdout.
+# The handler is attached to the "broll" logger only (not the root logger)
+# and the listener runs between startup and shutdown.
+logger = logging.getLogger("broll")
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_handler)
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+
+def _start_logging() -> None:
+    """Attach the queue handler to the app logger and start the listener."""
+    logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+    logger.propagate = False
+    if _queue_handler not in logger.handlers:
+        logger.addHandler(_queue_handler)
+    _log_listener.start()
+
+
+def _stop_logging() -> None:
+    """Flush queued records and detach the queue handler."""
+    _log_listener.stop()
+    logger.removeHandler(_queue_handler)
+
+
+# Size of each chunk read from the upload and written to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Scratch directory for uploaded videos (point SCRATCH at a tmpfs mount for
+# memory-speed writes). Created once instead of a mkdtemp per request.
+SCRATCH_DIR = Path(os.getenv("SCRATCH", os.path.join(tempfile.gettempdir(), "broll")))
+SCRATCH_DIR.mkdir(parents=True, exist_ok=True)
+
+# Leading box types of ISO BMFF / QuickTime files (.mp4, .mov); older
+# QuickTime files may start with a box other than ftyp
+_ISO_BMFF_BOXES = (b"ftyp", b"moov", b"mdat", b"wide", b"free", b"skip")
+
+
+def _is_supported_video_header(header: bytes) -> bool:
+    """Check the first 12 bytes of a file for MP4/MOV, Matroska or AVI magic."""
+    return (
+        header[4:8] in _ISO_BMFF_BOXES
+        or header[:4] == b"\x1a\x45\xdf\xa3"  # Matroska / WebM (EBML)
+        or (header[:4] == b"RIFF" and header[8:12] == b"AVI ")
+    )
+
+
+# Largest accepted A-roll upload, in bytes (default: 2 GB)
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", 2 * 1024 ** 3))
+
+# Timelines of previous identical requests (same video bytes, metadata and
+# matching parameters), so re-runs skip the whole pipeline. Stored as JSON
+# bytes so callers can never mutate a cached entry.
+TIMELINE_CACHE_SIZE = int(os.getenv("TIMELINE_CACHE_SIZE", 128))
+TIMELINE_CACHE_TTL = float(os.getenv("TIMELINE_CACHE_TTL", 3600))
+_timeline_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+# Include the planner's per-segment debug_info block in /generate responses
+TIMELINE_DEBUG = os.getenv("TIMELINE_DEBUG", "").lower() in ("1", "true", "yes")
+
+# JSON file of B-roll metadata ({broll_id: metadata}) embedded at startup,
+# so requests using the library find its embeddings ready
+BROLL_LIBRARY_PATH = os.getenv("BROLL_LIBRARY_PATH")
+
+
+def _init_services(app: FastAPI) -> None:
+    """
+    Create the pipeline services once per worker process.
+    
+    The services hold OpenAI clients (with their connection pools) and the
+    embedding cache, so they are shared by all requests; per-request
+    settings are passed to their methods instead.
+    """
+    app.state.analyzer = BRollAnalyzer()
+    app.state.planner = TimelinePlanner(debug=TIMELINE_DEBUG)
+    
+    # OpenAI-backed services need a key; /generate reports a missing key
+    if os.getenv("OPENAI_API_KEY"):
+        app.state.transcriber = ArollTranscriber()
+        app.state.matcher = SemanticMatcher()
+
+
+async def _warm_broll_library(library_path: str) -> None:
+    """Embed a B-roll library in the background, logging any failure."""
+    try:
+        with open(library_path, "rb") as f:
+            library = orjson.loads(f.read())
+        broll_descriptions = await run_in_threadpool(_prepare_brolls, library)
+        logger.info("Precomputed embeddings for %d library B-rolls", len(broll_descriptions))
+    except Exception:
+        logger.exception("Could not precompute B-roll library %s", library_path)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Set up and tear down the worker process.
+    
+    On startup, starts the log writer, creates the shared services and, if
+    BROLL_LIBRARY_PATH is configured, starts embedding that library in the
+    background so the server accepts requests immediately (requests arriving
+    first embed what they need themselves; embeddings also persist in the
+    matcher's SQLite cache, so later restarts are served from disk). On
+    shutdown, cancels an unfinished warm-up and flushes the log writer.
+    """
+    _start_logging()
+    _init_services(app)
+    
+    warmup = None
+    if BROLL_LIBRARY_PATH and hasattr(app.state, "matcher"):
+        warmup = asyncio.ensure_future(_warm_broll_library(BROLL_LIBRARY_PATH))
+    app.state.broll_warmup = warmup
+    
+    try:
+        yield
+    finally:
+        if warmup is not None and not warmup.done():
+            warmup.cancel()
+            with suppress(asyncio.CancelledError):
+                await warmup
+        _stop_logging()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Smart B-Roll Inserter API",
     description="Automatically generates timeline plans for B-roll insertion",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# CORS middleware
+# CORS middleware: explicit origins (comma-separated CORS_ORIGINS, defaulting
+# to the React dev server) and a 24h preflight cache
+CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000")
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
+    allow_origins=[origin.strip() for origin in CORS_ORIGINS.split(",") if origin.strip()],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,
 )
 
+# Compress timeline JSON responses (level 5 balances CPU against ratio)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+def _save_upload(upload: UploadFile, dest_path: str) -> str:
+    """
+    Copy an upload's spooled file to disk in fixed-size chunks.
+    
+    Args:
+        upload: Uploaded file
+        dest_path: Path to write the file to
+        
+    Returns:
+        Hex digest of the file content, hashed while copying
+    """
+    hasher = hashlib.blake2b()
+    upload.file.seek(0)
+    with open(dest_path, "wb") as dest:
+        while chunk := upload.file.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            dest.write(chunk)
+    return hasher.hexdigest()
+
+
+def _request_key(
+    video_digest: str,
+    video_filename: str,
+    broll_metadata: Dict[str, Any],
+    similarity_threshold: float,
+    min_insertions: int,
+    max_insertions: int
+) -> str:
+    """Hash everything that determines the generated timeline."""
+    hasher = hashlib.blake2b(video_digest.encode("utf-8"), digest_size=16)
+    hasher.update(video_filename.encode("utf-8"))
+    hasher.update(orjson.dumps(broll_metadata, option=orjson.OPT_SORT_KEYS))
+    hasher.update(f"{similarity_threshold}|{min_insertions}|{max_insertions}".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _get_cached_timeline(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Return a copy of a cached timeline if present and not expired.
+    
+    Each copy gets its own timeline_id and created_at, like a freshly
+    generated timeline.
+    """
+    entry = _timeline_cache.get(key)
+    if entry is None:
+        return None
+    
+    stored_at, timeline_json = entry
+    if time.monotonic() - stored_at > TIMELINE_CACHE_TTL:
+        del _timeline_cache[key]
+        return None
+    
+    _timeline_cache.move_to_end(key)
+    timeline = orjson.loads(timeline_json)
+    timeline["timeline_id"] = str(uuid.uuid4())
+    timeline["created_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return timeline
+
+
+def _cache_timeline(key: str, timeline: Dict[str, Any]) -> None:
+    """Store a timeline, evicting the least recently used entry if full."""
+    _timeline_cache[key] = (time.monotonic(), orjson.dumps(timeline))
+    _timeline_cache.move_to_end(key)
+    if len(_timeline_cache) > TIMELINE_CACHE_SIZE:
+        _timeline_cache.popitem(last=False)
+
+
+def _etag(request_key: str) -> str:
+    """
+    Entity tag of a request's timeline.
+    
+    Weak, since repeated requests get equivalent timelines that differ
+    only in timeline_id and created_at.
+    """
+    return f'W/"{request_key}"'
+
 
 # Request/Response Models
 class BRollMetadata(BaseModel):
@@ -99,6 +322,7 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/generate": "POST - Generate timeline plan",
+            "/generate/stream": "POST - Generate timeline plan, streaming progress (NDJSON)",
             "/health": "GET - Health check",
             "/docs": "GET - API documentation"
         }
@@ -114,6 +338,202 @@ async def health_check():
     }
 
 
+async def _prepare_upload(
+    aroll_video: UploadFile,
+    broll_metadata: str,
+    similarity_threshold: float,
+    min_insertions: int,
+    max_insertions: int
+) -> Tuple[str, Dict[str, Any], str]:
+    """
+    Validate a generate request and save its A-roll video to scratch space.
+    
+    Args:
+        aroll_video: Uploaded A-roll video
+        broll_metadata: JSON string of B-roll metadata
+        similarity_threshold: Similarity threshold (0.0-1.0)
+        min_insertions: Minimum insertions
+        max_insertions: Maximum insertions
+        
+    Returns:
+        Tuple of (temporary video path, parsed B-roll metadata, request key)
+    """
+    # Validate OpenAI API key
+    if not os.getenv("OPENAI_API_KEY"):
+        raise HTTPException(
+            status_code=500,
+            detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
+        )
+    
+    # Validate video file
+    if not aroll_video.filename.endswith(('.mp4', '.mov', '.avi', '.mkv')):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid video format. Supported: .mp4, .mov, .avi, .mkv"
+        )
+    
+    # Check the container magic bytes, since the filename alone is spoofable
+    header = await aroll_video.read(12)
+    await aroll_video.seek(0)
+    if not _is_supported_video_header(header):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid video file. Supported: .mp4, .mov, .avi, .mkv"
+        )
+    
+    # Reject oversized uploads before touching the disk
+    if aroll_video.size is not None and aroll_video.size > MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Video too large. Maximum size: {MAX_UPLOAD_SIZE} bytes"
+        )
+    
+    # Parse B-roll metadata
+    try:
+        broll_metadata_dict = orjson.loads(broll_metadata)
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid JSON in broll_metadata: {str(e)}"
+        )
+    
+    # Validate B-roll metadata structure
+    if not isinstance(broll_metadata_dict, dict):
+        raise HTTPException(
+            status_code=400,
+            detail="broll_metadata must be a dictionary mapping broll_id to metadata"
+        )
+    
+    # Reserve a uniquely named file in the scratch directory
+    with tempfile.NamedTemporaryFile(
+        dir=SCRATCH_DIR,
+        suffix=Path(aroll_video.filename).suffix,
+        delete=False
+    ) as tmp:
+        temp_aroll_path = tmp.name
+    
+    # Save uploaded A-roll video straight from its spooled file,
+    # without materializing the whole video as bytes
+    try:
+        video_digest = await run_in_threadpool(_save_upload, aroll_video, temp_aroll_path)
+    except BaseException:
+        Path(temp_aroll_path).unlink(missing_ok=True)
+        raise
+    
+    # Identical requests produce identical timelines
+    request_key = _request_key(
+        video_digest,
+        aroll_video.filename,
+        broll_metadata_dict,
+        similarity_threshold,
+        min_insertions,
+        max_insertions
+    )
+    
+    return temp_aroll_path, broll_metadata_dict, request_key
+
+
+def _prepare_brolls(broll_metadata_dict: Dict[str, Any]) -> Dict[str, str]:
+    """Describe the B-rolls and embed any the matcher has not seen yet."""
+    broll_descriptions = app.state.analyzer.analyze_brolls(broll_metadata_dict)
+    app.state.matcher.precompute_broll(broll_descriptions)
+    return broll_descriptions
+
+
+async def _run_pipeline(
+    temp_aroll_path: str,
+    video_filename: str,
+    broll_metadata_dict: Dict[str, Any],
+    similarity_threshold: float,
+    min_insertions: int,
+    max_insertions: int,
+    request_key: str
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the pipeline, yielding a progress event as each stage completes.
+    
+    The pipeline stages are blocking (network calls, audio extraction,
+    NumPy work), so each one runs in Starlette's threadpool to keep the
+    event loop free for other requests. B-roll analysis and embedding do
+    not depend on the transcript, so they run while the A-roll is being
+    transcribed. The last event is
+    {"stage": "done", "timeline": {...}}. The temporary video is removed
+    once the pipeline finishes or fails.
+    
+    Args:
+        temp_aroll_path: Path to the saved A-roll video
+        video_filename: Original A-roll filename (recorded in the timeline)
+        broll_metadata_dict: Parsed B-roll metadata
+        similarity_threshold: Similarity threshold (0.0-1.0)
+        min_insertions: Minimum insertions
+        max_insertions: Maximum insertions
+        request_key: Cache key of the request
+    """
+    brolls_task = None
+    try:
+        cached_timeline = _get_cached_timeline(request_key)
+        if cached_timeline is not None:
+            logger.info("Returning cached timeline")
+            yield {"stage": "done", "timeline": cached_timeline}
+            return
+        
+        # Step 2 (in the background): Analyze and embed B-rolls
+        logger.info("Step 2: Analyzing B-roll metadata...")
+        brolls_task = asyncio.ensure_future(
+            run_in_threadpool(_prepare_brolls, broll_metadata_dict)
+        )
+        
+        # Step 1: Transcribe A-roll
+        logger.info("Step 1: Transcribing A-roll video...")
+        aroll_segments = await run_in_threadpool(
+            app.state.transcriber.transcribe_video, temp_aroll_path, keep_audio_file=False
+        )
+        logger.info("Transcribed %d segments", len(aroll_segments))
+        yield {"stage": "transcribe", "segments": len(aroll_segments)}
+        
+        broll_descriptions = await brolls_task
+        logger.info("Analyzed %d B-rolls", len(broll_descriptions))
+        yield {"stage": "analyze", "brolls": len(broll_descriptions)}
+        
+        # Step 3: Match segments
+        logger.info("Step 3: Matching A-roll segments with B-rolls...")
+        broll_matches = await run_in_threadpool(
+            app.state.matcher.match,
+            aroll_segments,
+            broll_descriptions,
+            similarity_threshold=similarity_threshold,
+            min_insertions=min_insertions,
+            max_insertions=max_insertions
+        )
+        logger.info("Found %d matches", len(broll_matches))
+        yield {"stage": "match", "matches": len(broll_matches)}
+        
+        # Step 4: Generate timeline
+        logger.info("Step 4: Generating timeline...")
+        timeline = await run_in_threadpool(
+            app.state.planner.create_timeline,
+            aroll_segments,
+            broll_matches,
+            video_filename
+        )
+        logger.info("Timeline generated with %d segments", len(timeline["segments"]))
+        
+        _cache_timeline(request_key, timeline)
+        yield {"stage": "done", "timeline": timeline}
+    
+    finally:
+        # Don't leave B-roll work running (or its error unretrieved) when
+        # transcription fails or the client goes away
+        if brolls_task is not None:
+            if not brolls_task.done():
+                brolls_task.cancel()
+            elif not brolls_task.cancelled():
+                brolls_task.exception()
+        
+        # Cleanup temporary files
+        Path(temp_aroll_path).unlink(missing_ok=True)
+
+
 @app.post("/generate")
 async def generate_timeline(
     aroll_video: UploadFile = File(..., description="A-roll video file (.mp4)"),
@@ -132,105 +552,84 @@ async def generate_timeline(
     4. Generate timeline JSON
     
     Returns:
-        Complete timeline JSON with segments, statistics, and debug info
+        Complete timeline JSON with segments, statistics, and (with
+        TIMELINE_DEBUG set) debug info
     """
-    temp_dir = None
-    temp_aroll_path = None
-    
     try:
-        # Validate OpenAI API key
-        if not os.getenv("OPENAI_API_KEY"):
-            raise HTTPException(
-                status_code=500,
-                detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
-            )
-        
-        # Validate video file
-        if not aroll_video.filename.endswith(('.mp4', '.mov', '.avi', '.mkv')):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid video format. Supported: .mp4, .mov, .avi, .mkv"
-            )
-        
-        # Create temporary directory for file handling
-        temp_dir = tempfile.mkdtemp()
-        temp_aroll_path = os.path.join(temp_dir, aroll_video.filename)
-        
-        # Save uploaded A-roll video
-        with open(temp_aroll_path, "wb") as f:
-            content = await aroll_video.read()
-            f.write(content)
-        
-        # Parse B-roll metadata
-        try:
-            broll_metadata_dict = json.loads(broll_metadata)
-        except json.JSONDecodeError as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid JSON in broll_metadata: {str(e)}"
-            )
-        
-        # Validate B-roll metadata structure
-        if not isinstance(broll_metadata_dict, dict):
-            raise HTTPException(
-                status_code=400,
-                detail="broll_metadata must be a dictionary mapping broll_id to metadata"
-            )
-        
-        # Step 1: Transcribe A-roll
-        print("Step 1: Transcribing A-roll video...")
-        transcriber = ArollTranscriber()
-        aroll_segments = transcriber.transcribe_video(temp_aroll_path, keep_audio_file=False)
-        print(f"✓ Transcribed {len(aroll_segments)} segments")
-        
-        # Step 2: Analyze B-rolls
-        print("Step 2: Analyzing B-roll metadata...")
-        analyzer = BRollAnalyzer()
-        broll_descriptions = analyzer.analyze_brolls(broll_metadata_dict)
-        print(f"✓ Analyzed {len(broll_descriptions)} B-rolls")
-        
-        # Step 3: Match segments
-        print("Step 3: Matching A-roll segments with B-rolls...")
-        matcher = SemanticMatcher(
-            similarity_threshold=similarity_threshold,
-            min_insertions=min_insertions,
-            max_insertions=max_insertions
+        temp_aroll_path, broll_metadata_dict, request_key = await _prepare_upload(
+            aroll_video, broll_metadata, similarity_threshold, min_insertions, max_insertions
         )
-        broll_matches = matcher.match(aroll_segments, broll_descriptions)
-        print(f"✓ Found {len(broll_matches)} matches")
         
-        # Step 4: Generate timeline
-        print("Step 4: Generating timeline...")
-        planner = TimelinePlanner(aroll_video_path=aroll_video.filename)
-        timeline = planner.create_timeline(aroll_segments, broll_matches)
-        print(f"✓ Timeline generated with {len(timeline['segments'])} segments")
+        timeline = None
+        async for event in _run_pipeline(
+            temp_aroll_path,
+            aroll_video.filename,
+            broll_metadata_dict,
+            similarity_threshold,
+            min_insertions,
+            max_insertions,
+            request_key
+        ):
+            timeline = event.get("timeline")
         
         # Return timeline JSON
-        return JSONResponse(content=timeline)
+        return ORJSONResponse(content=timeline, headers={"ETag": _etag(request_key)})
     
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
+
+
+@app.post("/generate/stream")
+async def generate_timeline_stream(
+    aroll_video: UploadFile = File(..., description="A-roll video file (.mp4)"),
+    broll_metadata: str = Form(..., description="JSON string of B-roll metadata"),
+    similarity_threshold: float = Form(0.72, description="Similarity threshold (0.0-1.0)"),
+    min_insertions: int = Form(3, description="Minimum insertions"),
+    max_insertions: int = Form(6, description="Maximum insertions")
+):
+    """
+    Generate timeline plan, streaming progress as newline-delimited JSON.
     
-    finally:
-        # Cleanup temporary files
-        if temp_aroll_path and os.path.exists(temp_aroll_path):
-            try:
-                os.remove(temp_aroll_path)
-            except:
-                pass
-        if temp_dir and os.path.exists(temp_dir):
-            try:
-                os.rmdir(temp_dir)
-            except:
-                pass
+    Emits one JSON object per line as each stage completes, e.g.
+    {"stage": "transcribe", "segments": 42}, and ends with
+    {"stage": "done", "timeline": {...}}. Request validation errors are
+    returned as normal HTTP errors; failures once streaming has started are
+    reported as a final {"stage": "error", "detail": "..."} line.
+    """
+    temp_aroll_path, broll_metadata_dict, request_key = await _prepare_upload(
+        aroll_video, broll_metadata, similarity_threshold, min_insertions, max_insertions
+    )
+    
+    async def stream_events():
+        try:
+            async for event in _run_pipeline(
+                temp_aroll_path,
+                aroll_video.filename,
+                broll_metadata_dict,
+                similarity_threshold,
+                min_insertions,
+                max_insertions,
+                request_key
+            ):
+                yield orjson.dumps(event) + b"\n"
+        except Exception as e:
+            logger.exception("Error: %s", e)
+            yield orjson.dumps({"stage": "error", "detail": f"Internal server error: {str(e)}"}) + b"\n"
+    
+    return StreamingResponse(
+        stream_events(),
+        media_type="application/x-ndjson",
+        # Identity encoding keeps the gzip middleware from buffering progress lines
+        headers={"ETag": _etag(request_key), "Content-Encoding": "identity"},
+        # Covers clients that disconnect before the pipeline starts
+        background=BackgroundTask(Path(temp_aroll_path).unlink, missing_ok=True)
+    )
 
 
 
@@ -242,6 +641,6 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=port,
-        reload=True
+        reload=os.getenv("DEV") == "1"
     )
 
@@ -6,11 +6,86 @@ for semantic matching with A-roll content.
 """
 
 import os
-import json
-from typing import Dict, List, Any, Optional
+import re
+import logging
+import orjson
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 
+logger = logging.getLogger("broll")
+
+# Runs of whitespace, collapsed to a single space in descriptions
+_WS_RE = re.compile(r'\s+')
+
+# Common metadata field names (case-insensitive matching), in priority order
+_FIELD_MAPPING = {
+    'title': ['title', 'name', 'clip_name', 'video_title'],
+    'description': ['description', 'desc', 'summary', 'content'],
+    'category': ['category', 'type', 'genre', 'tag'],
+    'subject': ['subject', 'topic', 'theme', 'focus'],
+    'action': ['action', 'activity', 'what', 'shows'],
+    'location': ['location', 'place', 'setting', 'where'],
+    'objects': ['objects', 'items', 'products', 'things'],
+    'mood': ['mood', 'tone', 'atmosphere', 'feeling'],
+    'tags': ['tags', 'keywords', 'labels']
+}
+
+# Reverse index built once: casefolded alias -> (standard key, priority
+# within that key)
+ALIAS_TO_STANDARD = {
+    alias.casefold(): (standard_key, priority)
+    for standard_key, aliases in _FIELD_MAPPING.items()
+    for priority, alias in enumerate(aliases)
+}
+KNOWN_ALIASES = frozenset(ALIAS_TO_STANDARD)
+
+# Descriptions shared across analyzer instances, keyed by a hash of the
+# normalized metadata so repeated B-roll libraries skip all string work
+DESCRIPTION_CACHE_SIZE = 4096
+_description_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_description_cache_lock = threading.Lock()
+
+
+def _stringify(value: Any, limit: Optional[int] = None) -> str:
+    """Render a scalar or list metadata value as a comma-separated string."""
+    if isinstance(value, list):
+        items = value[:limit] if limit is not None else value
+        return ', '.join(str(item) for item in items)
+    return str(value)
+
+
+def _metadata_key(metadata: Dict[str, Any]) -> bytes:
+    """Stable content hash of a metadata dictionary."""
+    canonical = orjson.dumps(
+        metadata,
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return hashlib.blake2b(canonical, digest_size=16).digest()
+
+
+def _get_cached_description(key: bytes) -> Optional[str]:
+    """Look up a cached description, marking it as recently used."""
+    with _description_cache_lock:
+        description = _description_cache.get(key)
+        if description is not None:
+            _description_cache.move_to_end(key)
+        return description
+
+
+def _cache_description(key: bytes, description: str) -> None:
+    """Store a description, evicting the least recently used entry if full."""
+    with _description_cache_lock:
+        _description_cache[key] = description
+        _description_cache.move_to_end(key)
+        if len(_description_cache) > DESCRIPTION_CACHE_SIZE:
+            _description_cache.popitem(last=False)
+
+
 class BRollAnalyzer:
     """Analyzes B-roll videos by converting metadata into text descriptions."""
     
@@ -31,11 +106,11 @@ class BRollAnalyzer:
         if isinstance(metadata, str):
             # Check if it's a file path
             if os.path.exists(metadata):
-                with open(metadata, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
+                with open(metadata, 'rb') as f:
+                    metadata = orjson.loads(f.read())
             else:
                 # Assume it's a JSON string
-                metadata = json.loads(metadata)
+                metadata = orjson.loads(metadata)
         
         if not isinstance(metadata, dict):
             raise ValueError(f"Metadata must be dict, JSON string, or file path. Got: {type(metadata)}")
@@ -52,35 +127,21 @@ class BRollAnalyzer:
         Returns:
             Dictionary with extracted key fields
         """
-        # Common metadata field names (case-insensitive matching)
-        field_mapping = {
-            'title': ['title', 'name', 'clip_name', 'video_title'],
-            'description': ['description', 'desc', 'summary', 'content'],
-            'category': ['category', 'type', 'genre', 'tag'],
-            'subject': ['subject', 'topic', 'theme', 'focus'],
-            'action': ['action', 'activity', 'what', 'shows'],
-            'location': ['location', 'place', 'setting', 'where'],
-            'objects': ['objects', 'items', 'products', 'things'],
-            'mood': ['mood', 'tone', 'atmosphere', 'feeling'],
-            'tags': ['tags', 'keywords', 'labels']
-        }
-        
         extracted = {}
-        metadata_lower = {k.lower(): v for k, v in metadata.items()}
+        priorities = {}
         
-        for standard_key, possible_keys in field_mapping.items():
-            for key in possible_keys:
-                if key.lower() in metadata_lower:
-                    value = metadata_lower[key.lower()]
-                    if value:  # Only include non-empty values
-                        extracted[standard_key] = value
-                        break
-        
-        # Also include any remaining fields that might be useful
+        # Single pass: map known aliases onto standard keys (keeping the
+        # highest-priority non-empty alias) and pass other scalars through
+        # for _build_description's fallback
         for key, value in metadata.items():
-            if key.lower() not in [k.lower() for keys in field_mapping.values() for k in keys]:
-                if isinstance(value, (str, int, float)) and value:
-                    extracted[key] = value
+            alias = ALIAS_TO_STANDARD.get(key.casefold())
+            if alias is not None:
+                standard_key, priority = alias
+                if value and priority < priorities.get(standard_key, len(KNOWN_ALIASES)):
+                    extracted[standard_key] = value
+                    priorities[standard_key] = priority
+            elif value and isinstance(value, (str, int, float)):
+                extracted[key] = value
         
         return extracted
     
@@ -108,10 +169,7 @@ class BRollAnalyzer:
         
         # Add objects if mentioned
         if 'objects' in fields:
-            objects_str = fields['objects']
-            if isinstance(objects_str, list):
-                objects_str = ', '.join(str(o) for o in objects_str)
-            parts.append(f"with {objects_str}")
+            parts.append(f"with {_stringify(fields['objects'])}")
         
         # Add location context
         if 'location' in fields:
@@ -139,19 +197,11 @@ class BRollAnalyzer:
         
         # If we have tags, append them
         if 'tags' in fields and len(parts) < 2:
-            tags = fields['tags']
-            if isinstance(tags, list):
-                tags_str = ', '.join(str(t) for t in tags[:3])  # Limit to 3 tags
-            else:
-                tags_str = str(tags)
-            parts.append(f"[{tags_str}]")
+            parts.append(f"[{_stringify(fields['tags'], limit=3)}]")  # Limit to 3 tags
         
-        # Build final description
+        # Build final description, collapsing any runs of whitespace
         if parts:
-            description = ' '.join(parts)
-            # Clean up any double spaces or awkward punctuation
-            description = ' '.join(description.split())
-            return description.strip()
+            return _WS_RE.sub(' ', ' '.join(parts)).strip()
         else:
             # Fallback: use any available field
             for key, value in fields.items():
@@ -159,6 +209,21 @@ class BRollAnalyzer:
                     return str(value)
             return "B-roll video clip"
     
+    def _describe(self, metadata: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Build a description from normalized metadata without raising.
+        
+        Args:
+            metadata: Normalized metadata dictionary
+            
+        Returns:
+            Tuple of (description, error message); exactly one is None
+        """
+        try:
+            return self._build_description(self._extract_key_fields(metadata)), None
+        except Exception as e:
+            return None, str(e)
+    
     def analyze_broll(
         self, 
         broll_id: str, 
@@ -175,8 +240,16 @@ class BRollAnalyzer:
             Text description of the B-roll
         """
         normalized = self._normalize_metadata(metadata)
+        
+        # Identical metadata always yields the same description
+        key = _metadata_key(normalized)
+        description = _get_cached_description(key)
+        if description is not None:
+            return description
+        
         fields = self._extract_key_fields(normalized)
         description = self._build_description(fields)
+        _cache_description(key, description)
         
         return description
     
@@ -196,17 +269,36 @@ class BRollAnalyzer:
             Format: { "broll_1": "description", "broll_2": "description", ... }
         """
         descriptions = {}
+        pending = {}  # broll_id -> (cache key, normalized metadata)
         
+        # Serve repeated metadata from the cache; only misses are described
         for broll_id, metadata in broll_metadata.items():
             try:
-                description = self.analyze_broll(broll_id, metadata)
-                descriptions[broll_id] = description
+                normalized = self._normalize_metadata(metadata)
+                key = _metadata_key(normalized)
             except Exception as e:
                 # Log error but continue with other B-rolls
-                print(f"Warning: Failed to analyze {broll_id}: {e}")
+                logger.warning("Failed to analyze %s: %s", broll_id, e)
                 descriptions[broll_id] = f"B-roll clip {broll_id}"
+                continue
+            
+            description = _get_cached_description(key)
+            if description is not None:
+                descriptions[broll_id] = description
+            else:
+                pending[broll_id] = (key, normalized)
+        
+        for broll_id, (key, normalized) in pending.items():
+            description, error = self._describe(normalized)
+            if error is not None:
+                logger.warning("Failed to analyze %s: %s", broll_id, error)
+                descriptions[broll_id] = f"B-roll clip {broll_id}"
+            else:
+                _cache_description(key, description)
+                descriptions[broll_id] = description
         
-        return descriptions
+        # Preserve the caller's B-roll order
+        return {broll_id: descriptions[broll_id] for broll_id in broll_metadata}
     
     def analyze_from_files(
         self, 
@@ -228,8 +320,8 @@ class BRollAnalyzer:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Metadata file not found: {file_path}")
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                broll_metadata[broll_id] = json.load(f)
+            with open(file_path, 'rb') as f:
+                broll_metadata[broll_id] = orjson.loads(f.read())
         
         return self.analyze_brolls(broll_metadata)
     
@@ -253,8 +345,8 @@ class BRollAnalyzer:
             "total_brolls": len(descriptions)
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
         
         return output_path
 
@@ -6,12 +6,327 @@ OpenAI embeddings and cosine similarity.
 """
 
 import os
-import json
+import re
+import base64
+import logging
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
-from typing import List, Dict, Any, Tuple
+import orjson
+from typing import List, Dict, Any, Tuple, Optional
 from pathlib import Path
 import openai
 
+try:
+    import simsimd  # Optional SIMD (AVX-512/NEON) similarity kernels
+except ImportError:
+    simsimd = None
+
+try:
+    import faiss  # Optional BLAS-backed inner-product index
+except ImportError:
+    faiss = None
+
+try:
+    import fcntl  # POSIX file locks for the shared HNSW graph files
+except ImportError:
+    fcntl = None
+
+try:
+    from numba import njit  # Optional JIT for the match selection loop
+except ImportError:
+    njit = None
+
+try:
+    import ijson.backends.yajl2_c as ijson  # Optional streaming JSON parser
+except ImportError:
+    ijson = None
+
+
+logger = logging.getLogger("broll")
+
+# Inputs per embeddings request (the API accepts up to 2048); smaller
+# batches let long transcripts be embedded over concurrent requests
+EMBEDDING_BATCH_SIZE = 256
+
+# Maximum number of embeddings requests in flight at once
+EMBEDDING_MAX_CONCURRENCY = 8
+
+# Number of vectors kept in memory in front of the SQLite store
+EMBEDDING_MEMORY_CACHE_SIZE = 8192
+
+# Cached vectors are stored at half precision (3 KB per 1536-dim vector);
+# they are upcast to float32 only for the similarity computation
+EMBEDDING_STORAGE_DTYPE = np.float16
+
+# Default embedding store, under the backend directory regardless of the
+# working directory the server or scripts are started from
+DEFAULT_EMBEDDING_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "embedding_cache.db"
+
+
+def _quantize_int8(vector: np.ndarray) -> np.ndarray:
+    """
+    Symmetric per-vector int8 quantization (scale = max|v| / 127).
+    
+    The scale itself is dropped: cosine similarity does not depend on a
+    vector's length, so the codes can be scored directly.
+    """
+    vector = np.asarray(vector, dtype=np.float32)
+    peak = float(np.abs(vector).max())
+    if peak == 0.0:
+        return np.zeros(vector.shape, dtype=np.int8)
+    return np.rint(vector * (127.0 / peak)).astype(np.int8)
+
+
+# B-roll libraries at least this large are kept in memory as int8 codes;
+# smaller ones stay float32 so their scores near the threshold are exact
+QUANTIZE_MIN_BROLLS = 5000
+
+# B-roll libraries at least this large are searched through an HNSW graph
+# (approximate, sub-linear per segment) instead of scoring every clip; the
+# latest library's graph is persisted next to the embedding cache
+HNSW_MIN_BROLLS = 10000
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Nearest B-rolls scored per A-roll segment when searching the HNSW graph;
+# the rest count as below any threshold
+HNSW_TOP_K = 64
+
+# Theme keywords reported in match reasons, in priority order
+_REASON_KEYWORDS = (
+    "product", "demo", "demonstration", "app", "application",
+    "office", "work", "working", "code", "coding", "programming",
+    "team", "collaboration", "data", "analytics", "visualization",
+    "typing", "keyboard", "interface", "screen"
+)
+_REASON_KEYWORD_SET = frozenset(_REASON_KEYWORDS)
+
+_tokenize = re.compile(r"[a-z]+").findall
+
+# Segment fields used for matching; anything else in a transcript
+# (e.g. word-level timings) is dropped while streaming
+_SEGMENT_FIELDS = ("start_time", "end_time", "text")
+
+
+def _greedy_select(
+    seg_indices,
+    broll_indices,
+    start_times,
+    n_segments: int,
+    n_brolls: int,
+    min_insertions: int,
+    max_insertions: int
+) -> np.ndarray:
+    """
+    Greedily pick candidates under the spacing and reuse constraints.
+    
+    Candidates must be ordered best first. Written in plain loops over
+    flat arrays so it can be compiled by Numba when installed.
+    
+    Args:
+        seg_indices: A-roll segment index of each candidate
+        broll_indices: B-roll column index of each candidate
+        start_times: Segment start time of each candidate
+        n_segments: Number of A-roll segments
+        n_brolls: Number of B-rolls
+        min_insertions: Minimum number of B-roll insertions
+        max_insertions: Maximum number of B-roll insertions
+        
+    Returns:
+        Positions of the chosen candidates, in selection order
+    """
+    chosen = np.empty(max(min_insertions, max_insertions, 0), dtype=np.int64)
+    count = 0
+    segment_used = np.zeros(n_segments, dtype=np.bool_)
+    broll_uses = np.zeros(n_brolls, dtype=np.int64)
+    last_insertion_time = -10.0  # Track last insertion to avoid clustering
+    
+    for k in range(len(seg_indices)):
+        # Check if we've reached max insertions
+        if count >= max_insertions:
+            break
+        
+        seg_idx = seg_indices[k]
+        broll_idx = broll_indices[k]
+        start_time = start_times[k]
+        
+        # Skip if this segment already has a match
+        if segment_used[seg_idx]:
+            continue
+        
+        # Skip if B-roll is used too many times (max 2 uses per B-roll)
+        if broll_uses[broll_idx] >= 2:
+            continue
+        
+        # Skip if too close to previous insertion (min 5 seconds gap)
+        if start_time - last_insertion_time < 5.0:
+            continue
+        
+        chosen[count] = k
+        count += 1
+        segment_used[seg_idx] = True
+        broll_uses[broll_idx] += 1
+        last_insertion_time = start_time
+    
+    # If we have fewer than min_insertions, relax the time constraint
+    # to 3 seconds and drop the reuse limit
+    if count < min_insertions:
+        for k in range(len(seg_indices)):
+            if count >= min_insertions:
+                break
+            
+            seg_idx = seg_indices[k]
+            start_time = start_times[k]
+            
+            if segment_used[seg_idx]:
+                continue
+            
+            if start_time - last_insertion_time < 3.0:
+                continue
+            
+            chosen[count] = k
+            count += 1
+            segment_used[seg_idx] = True
+            broll_uses[broll_indices[k]] += 1
+            last_insertion_time = start_time
+    
+    return chosen[:count]
+
+
+_greedy_select_jit = njit(cache=True)(_greedy_select) if njit is not None else None
+
+
+def _load_segments(path: str) -> List[Dict[str, Any]]:
+    """
+    Load transcript segments, keeping only the fields used for matching.
+
+    With ijson installed the file is streamed one segment at a time, so
+    the full document tree is never held in memory.
+
+    Args:
+        path: Path to the A-roll transcript JSON
+
+    Returns:
+        List of segment dictionaries
+    """
+    with open(path, 'rb') as f:
+        if ijson is None:
+            segments = orjson.loads(f.read()).get("segments", [])
+        else:
+            segments = ijson.items(f, "segments.item", use_float=True)
+        return [
+            {key: segment[key] for key in _SEGMENT_FIELDS if key in segment}
+            for segment in segments
+        ]
+
+
+@lru_cache(maxsize=4096)
+def _text_tokens(text: str) -> frozenset:
+    """Lowercased word set of a text, memoized across matches and runs."""
+    return frozenset(_tokenize(text.lower()))
+
+
+class EmbeddingCache:
+    """
+    Persistent SQLite store of embedding vectors keyed by text hash,
+    fronted by an in-process LRU for vectors used within the same run.
+    """
+    
+    def __init__(self, db_path: str = None, memory_size: int = EMBEDDING_MEMORY_CACHE_SIZE):
+        """
+        Initialize the embedding cache.
+        
+        Args:
+            db_path: Path to the SQLite database. If None, reads from
+                     EMBEDDING_CACHE_PATH env var (default:
+                     backend/.cache/embedding_cache.db).
+            memory_size: Maximum number of vectors kept in memory
+        """
+        self.db_path = db_path or os.getenv("EMBEDDING_CACHE_PATH") or str(DEFAULT_EMBEDDING_CACHE_PATH)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings_f16 (hash TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def text_hash(model: str, text: str) -> str:
+        """Cache key for a text embedded with a given model."""
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+    
+    def get_many(self, hashes: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up cached vectors.
+        
+        Args:
+            hashes: Cache keys to look up
+            
+        Returns:
+            Dictionary mapping each cached key to its float16 vector
+        """
+        found = {}
+        with self._lock:
+            for h in hashes:
+                vec = self._memory.get(h)
+                if vec is not None:
+                    self._memory.move_to_end(h)
+                    found[h] = vec
+            
+            remaining = [h for h in hashes if h not in found]
+            if not remaining:
+                return found
+            
+            placeholders = ",".join("?" * len(remaining))
+            rows = self._conn.execute(
+                f"SELECT hash, vec FROM embeddings_f16 WHERE hash IN ({placeholders})",
+                remaining
+            ).fetchall()
+            
+            loaded = {h: np.frombuffer(vec, dtype=EMBEDDING_STORAGE_DTYPE) for h, vec in rows}
+            self._remember(loaded)
+        
+        found.update(loaded)
+        return found
+    
+    def put_many(self, vectors: Dict[str, np.ndarray]) -> None:
+        """
+        Store vectors in the cache.
+        
+        Args:
+            vectors: Dictionary mapping cache key to embedding vector
+        """
+        if not vectors:
+            return
+        
+        vectors = {h: np.asarray(vec, dtype=EMBEDDING_STORAGE_DTYPE) for h, vec in vectors.items()}
+        rows = [(h, vec.tobytes()) for h, vec in vectors.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings_f16 (hash, vec) VALUES (?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._remember(vectors)
+    
+    def _remember(self, vectors: Dict[str, np.ndarray]) -> None:
+        """Add vectors to the in-memory LRU (caller holds the lock)."""
+        for h, vec in vectors.items():
+            self._memory[h] = vec
+            self._memory.move_to_end(h)
+        
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
 
 class SemanticMatcher:
     """Matches A-roll segments with B-roll clips using semantic similarity."""
@@ -21,7 +336,8 @@ class SemanticMatcher:
         api_key: str = None,
         similarity_threshold: float = 0.72,
         min_insertions: int = 3,
-        max_insertions: int = 6
+        max_insertions: int = 6,
+        embedding_cache: Optional[EmbeddingCache] = None
     ):
         """
         Initialize the semantic matcher.
@@ -31,6 +347,8 @@ class SemanticMatcher:
             similarity_threshold: Minimum cosine similarity for a match (0.0-1.0)
             min_insertions: Minimum number of B-roll insertions (default: 3)
             max_insertions: Maximum number of B-roll insertions (default: 6)
+            embedding_cache: Cache for A-roll and B-roll text embeddings. If
+                             None, opens the default on-disk cache.
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
@@ -43,6 +361,78 @@ class SemanticMatcher:
         
         # Embedding model
         self.embedding_model = "text-embedding-3-small"  # Fast and cost-effective
+        
+        # Transcripts and B-roll libraries are often re-sent unchanged, so
+        # embeddings are persisted across runs
+        self.embedding_cache = embedding_cache or EmbeddingCache()
+        
+        # The B-roll library rarely changes between requests, so its vectors
+        # are also kept per broll_id, as int8 codes (4x smaller than float32)
+        # for large libraries: broll_id -> (description, vector)
+        self._broll_cache: Dict[str, Tuple[str, np.ndarray]] = {}
+        
+        # HNSW graph of the last large library: (library key, index)
+        self._hnsw_index: Optional[Tuple[str, Any]] = None
+        self._hnsw_lock = threading.Lock()
+    
+    def precompute_broll(self, broll_descriptions: Dict[str, str]) -> int:
+        """
+        Embed a B-roll library ahead of matching.
+        
+        Only clips that are new or whose description changed are embedded;
+        later match() calls stack the remembered vectors without any API or
+        cache lookups for the B-roll side.
+        
+        Args:
+            broll_descriptions: Dictionary mapping broll_id to description
+            
+        Returns:
+            Number of descriptions that were (re-)embedded
+        """
+        broll_ids = [b_id for b_id, text in broll_descriptions.items() if text.strip()]
+        _, n_embedded = self._resolve_broll_vectors(broll_ids, broll_descriptions)
+        return n_embedded
+    
+    def _resolve_broll_vectors(
+        self,
+        broll_ids: List[str],
+        broll_descriptions: Dict[str, str]
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Look up the vectors of B-roll descriptions, embedding stale ones.
+        
+        The matcher is shared across requests, so a concurrent call may
+        replace a broll_id's cache entry with another description at any
+        time; callers must use the returned vectors, not re-read the cache.
+        
+        Args:
+            broll_ids: B-roll IDs with non-blank descriptions
+            broll_descriptions: Dictionary mapping broll_id to description
+            
+        Returns:
+            Tuple of (vectors in broll_ids order, number of (re-)embedded descriptions)
+        """
+        quantize = len(broll_ids) >= QUANTIZE_MIN_BROLLS
+        dtype = np.int8 if quantize else np.float32
+        
+        vectors = {}
+        stale = []
+        for b_id in broll_ids:
+            entry = self._broll_cache.get(b_id)
+            if entry is not None and entry[0] == broll_descriptions[b_id] and entry[1].dtype == dtype:
+                vectors[b_id] = entry[1]
+            else:
+                stale.append(b_id)
+        
+        if stale:
+            texts = [broll_descriptions[b_id] for b_id in stale]
+            embeddings = self._get_cached_embeddings(texts)
+            for b_id, text, vector in zip(stale, texts, embeddings):
+                vector = _quantize_int8(vector) if quantize else vector.astype(np.float32)
+                self._broll_cache[b_id] = (text, vector)
+                vectors[b_id] = vector
+        
+        return [vectors[b_id] for b_id in broll_ids], len(stale)
     
     def _get_embeddings(self, texts: List[str]) -> np.ndarray:
         """
@@ -52,17 +442,187 @@ class SemanticMatcher:
             texts: List of text strings to embed
             
         Returns:
-            NumPy array of embeddings (n_texts, embedding_dim)
+            float32 NumPy array of embeddings (n_texts, embedding_dim)
         """
-        # Batch API call for efficiency
+        # Embed each distinct text once (first-seen order) and scatter back
+        positions = {}
+        inverse = [positions.setdefault(text, len(positions)) for text in texts]
+        unique_texts = list(positions)
+        
+        # Batch API calls, sending the batches concurrently
+        batches = [
+            unique_texts[start:start + EMBEDDING_BATCH_SIZE]
+            for start in range(0, len(unique_texts), EMBEDDING_BATCH_SIZE)
+        ]
+        if len(batches) == 1:
+            results = [self._embed_batch(batches[0])]
+        else:
+            max_workers = min(EMBEDDING_MAX_CONCURRENCY, len(batches))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(self._embed_batch, batches))
+        
+        embeddings = np.vstack(results)
+        if len(unique_texts) == len(texts):
+            return embeddings
+        return embeddings[inverse]
+    
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed one batch of texts with a single API request.
+        
+        Args:
+            texts: Text strings to embed (at most EMBEDDING_BATCH_SIZE)
+            
+        Returns:
+            float32 NumPy array of embeddings (n_texts, embedding_dim)
+        """
+        # base64 payloads are raw little-endian float32 bytes, much
+        # smaller on the wire than JSON floats and cheaper to decode
         response = self.client.embeddings.create(
             model=self.embedding_model,
-            input=texts
+            input=texts,
+            encoding_format="base64"
         )
         
-        # Extract embeddings
-        embeddings = [item.embedding for item in response.data]
-        return np.array(embeddings)
+        return np.stack([
+            np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+            for item in response.data
+        ])
+    
+    def _get_cached_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Get embeddings, serving repeated texts from the embedding cache.
+        
+        Only cache misses are sent to the API, in batches of
+        EMBEDDING_BATCH_SIZE requested concurrently (see _get_embeddings).
+        
+        Args:
+            texts: List of text strings to embed
+            
+        Returns:
+            float16 NumPy array of embeddings (n_texts, embedding_dim)
+        """
+        hashes = [EmbeddingCache.text_hash(self.embedding_model, text) for text in texts]
+        cached = self.embedding_cache.get_many(list(set(hashes)))
+        
+        missing = {h: text for h, text in zip(hashes, texts) if h not in cached}
+        if missing:
+            # Round to the storage precision so cold and warm calls score identically
+            new_embeddings = self._get_embeddings(list(missing.values())).astype(EMBEDDING_STORAGE_DTYPE)
+            new_vectors = dict(zip(missing.keys(), new_embeddings))
+            self.embedding_cache.put_many(new_vectors)
+            cached.update(new_vectors)
+        
+        return np.vstack([cached[h] for h in hashes])
+    
+    def _get_hnsw_index(
+        self,
+        broll_ids: List[str],
+        broll_descriptions: Dict[str, str],
+        broll_vectors: List[np.ndarray]
+    ):
+        """
+        Get the HNSW graph of a B-roll library, building it if needed.
+        
+        Graphs are keyed by the library's ids and descriptions, and loaded
+        from disk when a previous run already built the same library. Only
+        the latest library's graph is kept next to the embedding cache
+        (where POSIX file locks are available).
+        
+        Args:
+            broll_ids: B-roll IDs in similarity-matrix column order
+            broll_descriptions: Dictionary mapping broll_id to description
+            broll_vectors: Vectors of the B-rolls in column order
+            
+        Returns:
+            FAISS HNSW inner-product index with the B-rolls in column order
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        for b_id in broll_ids:
+            hasher.update(f"{b_id}\x00{broll_descriptions[b_id]}\x00".encode("utf-8"))
+        key = hasher.hexdigest()
+        
+        with self._hnsw_lock:
+            if self._hnsw_index is not None and self._hnsw_index[0] == key:
+                return self._hnsw_index[1]
+            
+            index_path = Path(self.embedding_cache.db_path).with_name(f"broll_hnsw_{key}.faiss")
+            
+            # Server workers share the directory: the lock file serializes
+            # reading, building and pruning graphs across processes
+            with open(index_path.with_name("broll_hnsw.lock"), "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                
+                if index_path.exists():
+                    index = faiss.read_index(str(index_path))
+                else:
+                    vectors = np.vstack(broll_vectors).astype(np.float32)
+                    faiss.normalize_L2(vectors)
+                    
+                    index = faiss.IndexHNSWFlat(vectors.shape[1], HNSW_M, faiss.METRIC_INNER_PRODUCT)
+                    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+                    index.add(vectors)
+                    
+                    # Written aside and renamed, so a graph file is always complete
+                    temp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+                    faiss.write_index(index, str(temp_path))
+                    os.replace(temp_path, index_path)
+                    
+                    # Only the current library's graph is kept on disk; without
+                    # a file lock, other processes' graphs are left alone
+                    if fcntl is not None:
+                        for stale_path in index_path.parent.glob("broll_hnsw_*.faiss"):
+                            if stale_path != index_path:
+                                try:
+                                    stale_path.unlink()
+                                except OSError:
+                                    pass
+            
+            index.hnsw.efSearch = HNSW_EF_SEARCH
+            self._hnsw_index = (key, index)
+            return index
+    
+    def _hnsw_candidates(
+        self,
+        aroll_embeddings: np.ndarray,
+        broll_ids: List[str],
+        broll_descriptions: Dict[str, str],
+        broll_vectors: List[np.ndarray],
+        similarity_threshold: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Candidate pairs among each segment's nearest B-rolls.
+        
+        Only the HNSW search results are scored, so no (n_segments,
+        n_brolls) matrix is built; pairs outside each segment's HNSW_TOP_K
+        nearest B-rolls are never candidates.
+        
+        Args:
+            aroll_embeddings: Embeddings for A-roll segments (n_segments, dim)
+            broll_ids: B-roll IDs (n_brolls)
+            broll_descriptions: Dictionary mapping broll_id to description
+            broll_vectors: Vectors of the B-rolls in broll_ids order
+            similarity_threshold: Minimum cosine similarity for a candidate
+            
+        Returns:
+            Tuple of (segment indices, B-roll indices, similarities) of the
+            pairs at or above the threshold, in segment-then-B-roll order
+        """
+        index = self._get_hnsw_index(broll_ids, broll_descriptions, broll_vectors)
+        
+        queries = np.array(aroll_embeddings, dtype=np.float32)
+        faiss.normalize_L2(queries)
+        scores, ids = index.search(queries, min(HNSW_TOP_K, len(broll_ids)))
+        
+        # Unfilled result slots come back as id -1
+        rows, slots = np.nonzero((ids >= 0) & (scores >= similarity_threshold))
+        cols = ids[rows, slots]
+        similarities = scores[rows, slots]
+        
+        # Results are ranked per segment; reorder to match the dense path
+        order = np.lexsort((cols, rows))
+        return rows[order], cols[order], similarities[order]
     
     def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
         """
@@ -75,14 +635,13 @@ class SemanticMatcher:
         Returns:
             Cosine similarity score (0.0-1.0)
         """
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+        # Squared norms via vdot avoid np.linalg.norm's dispatch overhead
+        norms_squared = np.vdot(vec1, vec1) * np.vdot(vec2, vec2)
         
-        if norm1 == 0 or norm2 == 0:
+        if norms_squared == 0:
             return 0.0
         
-        return dot_product / (norm1 * norm2)
+        return float(np.dot(vec1, vec2) / np.sqrt(norms_squared))
     
     def _calculate_similarity_matrix(
         self, 
@@ -99,12 +658,43 @@ class SemanticMatcher:
         Returns:
             Similarity matrix (n_segments, n_brolls)
         """
+        # Half-precision storage is upcast once here; float32 keeps the
+        # accumulation accurate and is what BLAS and SIMD kernels expect
+        aroll_embeddings = np.ascontiguousarray(aroll_embeddings, dtype=np.float32)
+        broll_embeddings = np.ascontiguousarray(broll_embeddings, dtype=np.float32)
+        
+        if simsimd is not None:
+            distances = simsimd.cdist(aroll_embeddings, broll_embeddings, metric="cosine")
+            return 1.0 - np.asarray(distances)
+        
+        if faiss is not None:
+            # Inner product of L2-normalized vectors is cosine similarity;
+            # searching all B-rolls returns each row's full score set
+            aroll_norm = aroll_embeddings.copy()
+            broll_norm = broll_embeddings.copy()
+            faiss.normalize_L2(aroll_norm)
+            faiss.normalize_L2(broll_norm)
+            
+            index = faiss.IndexFlatIP(broll_norm.shape[1])
+            index.add(broll_norm)
+            scores, ids = index.search(aroll_norm, len(broll_norm))
+            
+            # Results come back ranked per row; scatter them into B-roll order
+            similarity_matrix = np.empty_like(scores)
+            np.put_along_axis(similarity_matrix, ids, scores, axis=1)
+            return similarity_matrix
+        
+        # Row norms via einsum (no temporary squared array); zero-norm rows
+        # are left as zeros instead of dividing by zero
+        aroll_lengths = np.sqrt(np.einsum('ij,ij->i', aroll_embeddings, aroll_embeddings))[:, None]
+        broll_lengths = np.sqrt(np.einsum('ij,ij->i', broll_embeddings, broll_embeddings))[:, None]
+        
         # Normalize embeddings for cosine similarity
-        aroll_norm = aroll_embeddings / np.linalg.norm(aroll_embeddings, axis=1, keepdims=True)
-        broll_norm = broll_embeddings / np.linalg.norm(broll_embeddings, axis=1, keepdims=True)
+        aroll_norm = aroll_embeddings / np.where(aroll_lengths == 0, 1, aroll_lengths)
+        broll_norm = broll_embeddings / np.where(broll_lengths == 0, 1, broll_lengths)
         
         # Calculate cosine similarity matrix
-        similarity_matrix = np.dot(aroll_norm, broll_norm.T)
+        similarity_matrix = aroll_norm @ broll_norm.T
         
         return similarity_matrix
     
@@ -133,128 +723,94 @@ class SemanticMatcher:
         else:
             strength = "somewhat relevant"
         
-        # Try to identify common themes
-        aroll_lower = aroll_text.lower()
-        broll_lower = broll_description.lower()
-        
-        # Check for common keywords
-        common_keywords = []
-        keywords_to_check = [
-            "product", "demo", "demonstration", "app", "application",
-            "office", "work", "working", "code", "coding", "programming",
-            "team", "collaboration", "data", "analytics", "visualization",
-            "typing", "keyboard", "interface", "screen"
-        ]
-        
-        for keyword in keywords_to_check:
-            if keyword in aroll_lower and keyword in broll_lower:
-                common_keywords.append(keyword)
+        # Try to identify common themes: keywords appearing as words in both
+        common_keywords = (
+            _REASON_KEYWORD_SET & _text_tokens(aroll_text) & _text_tokens(broll_description)
+        )
         
         if common_keywords:
-            theme = common_keywords[0]
+            theme = min(common_keywords, key=_REASON_KEYWORDS.index)
             return f"{strength.capitalize()} match: both mention '{theme}'"
         else:
             return f"{strength.capitalize()} semantic match"
     
     def _select_best_matches(
         self,
-        similarity_matrix: np.ndarray,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        similarities: np.ndarray,
         aroll_segments: List[Dict[str, Any]],
         broll_ids: List[str],
-        broll_descriptions: Dict[str, str]
+        broll_descriptions: Dict[str, str],
+        min_insertions: int,
+        max_insertions: int
     ) -> List[Dict[str, Any]]:
         """
         Select best matches while avoiding random insertions.
         
         Args:
-            similarity_matrix: Similarity scores (n_segments, n_brolls)
+            rows: A-roll segment index of each candidate pair
+            cols: B-roll index of each candidate pair
+            similarities: Similarity of each candidate pair; candidates are
+                          the pairs at or above the similarity threshold, in
+                          segment-then-B-roll order
             aroll_segments: List of A-roll segments with timestamps
             broll_ids: List of B-roll IDs
             broll_descriptions: Dictionary mapping broll_id to description
+            min_insertions: Minimum number of B-roll insertions
+            max_insertions: Maximum number of B-roll insertions
             
         Returns:
             List of match dictionaries
         """
         matches = []
         
-        # Find all potential matches above threshold
-        potential_matches = []
-        
-        for seg_idx, segment in enumerate(aroll_segments):
-            for broll_idx, broll_id in enumerate(broll_ids):
-                similarity = similarity_matrix[seg_idx, broll_idx]
-                
-                if similarity >= self.similarity_threshold:
-                    potential_matches.append({
-                        "segment_idx": seg_idx,
-                        "broll_id": broll_id,
-                        "similarity": float(similarity),
-                        "start_time": segment["start_time"],
-                        "end_time": segment["end_time"],
-                        "aroll_text": segment["text"],
-                        "broll_description": broll_descriptions[broll_id]
-                    })
-        
-        # Sort by similarity (highest first)
-        potential_matches.sort(key=lambda x: x["similarity"], reverse=True)
+        # Sort by similarity (highest first); stable, so ties keep
+        # segment-then-B-roll order
+        order = np.argsort(-similarities, kind="stable")
         
         # Select matches with constraints:
         # 1. Avoid inserting multiple B-rolls too close together (min 5 seconds apart)
         # 2. Don't reuse the same B-roll too frequently
         # 3. Select top matches up to max_insertions
+        segment_starts = np.array(
+            [segment["start_time"] for segment in aroll_segments], dtype=np.float64
+        )
+        candidate_segments = rows[order]
+        candidate_brolls = cols[order]
+        candidate_starts = segment_starts[candidate_segments]
+        candidate_similarities = similarities[order]
+        selection_args = (len(aroll_segments), len(broll_ids), min_insertions, max_insertions)
         
-        selected_indices = set()
-        used_brolls = {}  # Track how many times each B-roll is used
-        last_insertion_time = -10.0  # Track last insertion to avoid clustering
-        
-        for match in potential_matches:
-            # Check if we've reached max insertions
-            if len(matches) >= self.max_insertions:
-                break
-            
-            seg_idx = match["segment_idx"]
-            broll_id = match["broll_id"]
-            start_time = match["start_time"]
-            
-            # Skip if this segment already has a match
-            if seg_idx in selected_indices:
-                continue
-            
-            # Skip if B-roll is used too many times (max 2 uses per B-roll)
-            if used_brolls.get(broll_id, 0) >= 2:
-                continue
-            
-            # Skip if too close to previous insertion (min 5 seconds gap)
-            if start_time - last_insertion_time < 5.0:
-                continue
-            
-            # Add this match
-            matches.append(match)
-            selected_indices.add(seg_idx)
-            used_brolls[broll_id] = used_brolls.get(broll_id, 0) + 1
-            last_insertion_time = start_time
+        if _greedy_select_jit is not None:
+            chosen = _greedy_select_jit(
+                candidate_segments.astype(np.int64),
+                candidate_brolls.astype(np.int64),
+                candidate_starts,
+                *selection_args
+            )
+        else:
+            # Plain lists index faster than arrays in the interpreter
+            chosen = _greedy_select(
+                candidate_segments.tolist(),
+                candidate_brolls.tolist(),
+                candidate_starts.tolist(),
+                *selection_args
+            )
         
-        # If we have fewer than min_insertions, relax constraints slightly
-        if len(matches) < self.min_insertions:
-            # Relax time constraint to 3 seconds
-            for match in potential_matches:
-                if len(matches) >= self.min_insertions:
-                    break
-                
-                seg_idx = match["segment_idx"]
-                broll_id = match["broll_id"]
-                start_time = match["start_time"]
-                
-                if seg_idx in selected_indices:
-                    continue
-                
-                if start_time - last_insertion_time < 3.0:
-                    continue
-                
-                matches.append(match)
-                selected_indices.add(seg_idx)
-                used_brolls[broll_id] = used_brolls.get(broll_id, 0) + 1
-                last_insertion_time = start_time
+        for k in chosen.tolist():
+            seg_idx = int(candidate_segments[k])
+            segment = aroll_segments[seg_idx]
+            broll_id = broll_ids[candidate_brolls[k]]
+            matches.append({
+                "segment_idx": seg_idx,
+                "broll_id": broll_id,
+                "similarity": float(candidate_similarities[k]),
+                "start_time": segment["start_time"],
+                "end_time": segment["end_time"],
+                "aroll_text": segment["text"],
+                "broll_description": broll_descriptions[broll_id]
+            })
         
         # Sort matches by start_time for chronological order
         matches.sort(key=lambda x: x["start_time"])
@@ -264,14 +820,23 @@ class SemanticMatcher:
     def match(
         self,
         aroll_segments: List[Dict[str, Any]],
-        broll_descriptions: Dict[str, str]
+        broll_descriptions: Dict[str, str],
+        similarity_threshold: Optional[float] = None,
+        min_insertions: Optional[int] = None,
+        max_insertions: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Match A-roll segments with B-roll descriptions.
         
+        Per-call settings override the instance defaults, so one matcher
+        can be shared across requests with different settings.
+        
         Args:
             aroll_segments: List of A-roll segments with start_time, end_time, text
             broll_descriptions: Dictionary mapping broll_id to description string
+            similarity_threshold: Overrides the instance similarity threshold
+            min_insertions: Overrides the instance minimum insertions
+            max_insertions: Overrides the instance maximum insertions
             
         Returns:
             List of match dictionaries with:
@@ -287,25 +852,53 @@ class SemanticMatcher:
         if not broll_descriptions:
             raise ValueError("B-roll descriptions dictionary is empty")
         
+        if similarity_threshold is None:
+            similarity_threshold = self.similarity_threshold
+        if min_insertions is None:
+            min_insertions = self.min_insertions
+        if max_insertions is None:
+            max_insertions = self.max_insertions
+        
+        # Nothing can be selected, so skip the embedding round-trips
+        if max(min_insertions, max_insertions) <= 0:
+            return []
+        
+        # Blank texts cannot match anything (and the embeddings API rejects
+        # empty input), so leave them out before embedding
+        aroll_segments = [seg for seg in aroll_segments if seg["text"].strip()]
+        broll_ids = [b_id for b_id, text in broll_descriptions.items() if text.strip()]
+        if not aroll_segments or not broll_ids:
+            return []
+        
         # Extract texts for embedding
         aroll_texts = [seg["text"] for seg in aroll_segments]
-        broll_ids = list(broll_descriptions.keys())
-        broll_texts = [broll_descriptions[b_id] for b_id in broll_ids]
         
-        # Get embeddings
-        print(f"Generating embeddings for {len(aroll_texts)} A-roll segments and {len(broll_texts)} B-rolls...")
-        aroll_embeddings = self._get_embeddings(aroll_texts)
-        broll_embeddings = self._get_embeddings(broll_texts)
+        # Get embeddings (B-rolls come from the per-library cache)
+        logger.info("Generating embeddings for %d A-roll segments and %d B-rolls", len(aroll_texts), len(broll_ids))
+        aroll_embeddings = self._get_cached_embeddings(aroll_texts)
+        broll_vectors, _ = self._resolve_broll_vectors(broll_ids, broll_descriptions)
         
-        # Calculate similarity matrix
-        similarity_matrix = self._calculate_similarity_matrix(aroll_embeddings, broll_embeddings)
+        # Find all potential matches above threshold
+        if faiss is not None and len(broll_ids) >= HNSW_MIN_BROLLS:
+            rows, cols, similarities = self._hnsw_candidates(
+                aroll_embeddings, broll_ids, broll_descriptions, broll_vectors, similarity_threshold
+            )
+        else:
+            broll_embeddings = np.vstack(broll_vectors)
+            similarity_matrix = self._calculate_similarity_matrix(aroll_embeddings, broll_embeddings)
+            rows, cols = np.nonzero(similarity_matrix >= similarity_threshold)
+            similarities = similarity_matrix[rows, cols]
         
         # Select best matches
         matches = self._select_best_matches(
-            similarity_matrix,
+            rows,
+            cols,
+            similarities,
             aroll_segments,
             broll_ids,
-            broll_descriptions
+            broll_descriptions,
+            min_insertions,
+            max_insertions
         )
         
         # Format output
@@ -345,13 +938,11 @@ class SemanticMatcher:
             List of match dictionaries
         """
         # Load A-roll transcript
-        with open(aroll_transcript_path, 'r', encoding='utf-8') as f:
-            aroll_data = json.load(f)
-            aroll_segments = aroll_data.get("segments", [])
+        aroll_segments = _load_segments(aroll_transcript_path)
         
         # Load B-roll descriptions
-        with open(broll_descriptions_path, 'r', encoding='utf-8') as f:
-            broll_data = json.load(f)
+        with open(broll_descriptions_path, 'rb') as f:
+            broll_data = orjson.loads(f.read())
             broll_descriptions = broll_data.get("broll_descriptions", {})
         
         return self.match(aroll_segments, broll_descriptions)
@@ -381,8 +972,11 @@ class SemanticMatcher:
             }
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(
+                output_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            ))
         
         return output_path
 
@@ -6,124 +6,382 @@ A-roll audio remains intact, B-roll visuals overlay at planned timestamps.
 """
 
 import os
-import json
+import shutil
+import tempfile
+import threading
 import subprocess
-from typing import Dict, List, Any, Optional, Tuple
+from collections import deque
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Callable
 from pathlib import Path
+import orjson
+
+
+# Well-known install locations checked when ffmpeg is not on PATH
+_COMMON_FFMPEG_PATHS = (
+    "/usr/bin/ffmpeg",
+    "/usr/local/bin/ffmpeg",
+    "C:\\ffmpeg\\bin\\ffmpeg.exe",
+    "C:\\Program Files\\ffmpeg\\bin\\ffmpeg.exe"
+)
+
+# Number of trailing ffmpeg stderr lines kept for error messages
+FFMPEG_STDERR_TAIL_LINES = 50
+
+# Receives each ffmpeg progress block (frame, out_time_ms, speed, progress, ...)
+ProgressCallback = Callable[[Dict[str, str]], None]
+
+# Hardware H.264 encoders, in order of preference
+_HW_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_videotoolbox")
+
+# Software fallback, always available in standard ffmpeg builds
+_DEFAULT_ENCODER = "libx264"
+
+# Concurrent encode sessions allowed by consumer NVIDIA drivers
+NVENC_MAX_SESSIONS = 3
+
+# Rate-control arguments per encoder, targeting similar quality
+_ENCODER_ARGS = {
+    "h264_nvenc": ["-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0"],
+    "h264_qsv": ["-preset", "fast", "-global_quality", "23"],
+    "h264_videotoolbox": ["-b:v", "8M"],
+    "libx264": ["-preset", "fast", "-crf", "23"]
+}
+
+# ffprobe H.264 profile names -> libx264 -profile:v values; re-encoded
+# chunks must match the A-roll's profile to be spliced with copied ones
+_X264_PROFILES = {
+    "Constrained Baseline": "baseline",
+    "Baseline": "baseline",
+    "Main": "main",
+    "High": "high",
+    "High 10": "high10",
+    "High 4:2:2": "high422",
+    "High 4:4:4 Predictive": "high444"
+}
+
+
+def _encoder_works(ffmpeg_path: str, encoder: str) -> bool:
+    """Encode a single synthetic frame to check the encoder's device is usable."""
+    try:
+        result = subprocess.run(
+            [
+                ffmpeg_path, "-hide_banner", "-v", "error",
+                "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+                "-frames:v", "1", "-c:v", encoder, "-f", "null", "-"
+            ],
+            capture_output=True,
+            timeout=15
+        )
+        return result.returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+@lru_cache(maxsize=8)
+def _detect_encoder(ffmpeg_path: str) -> str:
+    """
+    Pick the fastest usable H.264 encoder for an ffmpeg binary.
+    
+    Encoders compiled into ffmpeg are only chosen if a test encode
+    succeeds, since e.g. NVENC is often built in without a GPU present.
+    """
+    try:
+        listing = subprocess.run(
+            [ffmpeg_path, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return _DEFAULT_ENCODER
+    
+    available = {
+        fields[1] for fields in (line.split() for line in listing.splitlines())
+        if len(fields) > 1
+    }
+    for encoder in _HW_ENCODERS:
+        if encoder in available and _encoder_works(ffmpeg_path, encoder):
+            return encoder
+    
+    return _DEFAULT_ENCODER
+
+
+@lru_cache(maxsize=256)
+def _probe_video_file(ffprobe_path: str, video_path: str, mtime: float) -> bool:
+    """
+    Check a video file with ffprobe.
+    
+    Results are memoized; mtime is part of the key so a modified file
+    is probed again.
+    """
+    try:
+        result = subprocess.run(
+            [ffprobe_path, "-v", "error", video_path],
+            capture_output=True,
+            timeout=5
+        )
+        return result.returncode == 0
+    except:
+        # If ffprobe fails, assume file is valid
+        return True
+
+
+@lru_cache(maxsize=64)
+def _probe_keyframes(
+    ffprobe_path: str,
+    video_path: str,
+    mtime: float
+) -> Optional[Tuple[Tuple[Tuple[str, str], ...], Tuple[float, ...]]]:
+    """
+    Probe the video stream parameters and keyframe timestamps of a file.
+    
+    Only packets are read (no decoding). Results are memoized per file
+    version like _probe_video_file.
+    
+    Returns:
+        Tuple of (stream parameters as (name, value) pairs: codec_name,
+        profile, level, pix_fmt, r_frame_rate, time_base; sorted keyframe
+        times in seconds), or None if ffprobe is unavailable or the file
+        has no video keyframes
+    """
+    try:
+        result = subprocess.run(
+            [
+                ffprobe_path, "-v", "error", "-select_streams", "v:0",
+                "-show_entries",
+                "stream=codec_name,profile,level,pix_fmt,r_frame_rate,time_base:packet=pts_time,flags",
+                "-of", "json", video_path
+            ],
+            capture_output=True,
+            timeout=120
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    
+    if result.returncode != 0:
+        return None
+    
+    try:
+        info = orjson.loads(result.stdout)
+        stream = info["streams"][0]
+        params = tuple(
+            (name, str(stream[name]))
+            for name in ("codec_name", "profile", "level", "pix_fmt", "r_frame_rate", "time_base")
+            if name in stream
+        )
+        keyframes = tuple(sorted(
+            float(packet["pts_time"])
+            for packet in info.get("packets", [])
+            if "K" in packet.get("flags", "") and "pts_time" in packet
+        ))
+    except (ValueError, KeyError, IndexError):
+        return None
+    
+    return (params, keyframes) if keyframes else None
+
+
+@lru_cache(maxsize=64)
+def _probe_frame_size(ffprobe_path: str, video_path: str, mtime: float) -> Optional[Tuple[int, int]]:
+    """
+    Probe the (width, height) of a file's first video stream.
+    
+    Results are memoized per file version; None if ffprobe is unavailable.
+    """
+    try:
+        result = subprocess.run(
+            [
+                ffprobe_path, "-v", "error", "-select_streams", "v:0",
+                "-show_entries", "stream=width,height", "-of", "json", video_path
+            ],
+            capture_output=True,
+            timeout=10
+        )
+        stream = orjson.loads(result.stdout)["streams"][0]
+        return int(stream["width"]), int(stream["height"])
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, IndexError):
+        return None
 
 
 class VideoRenderer:
     """Renders video from timeline plan using ffmpeg."""
     
-    def __init__(self, ffmpeg_path: str = None):
+    def __init__(
+        self,
+        ffmpeg_path: str = None,
+        encoder: str = None,
+        stream_copy: bool = False,
+        threads: int = 0
+    ):
         """
         Initialize the video renderer.
         
         Args:
             ffmpeg_path: Path to ffmpeg executable. If None, uses 'ffmpeg' from PATH.
+            encoder: H.264 encoder name (e.g. 'h264_nvenc', 'libx264'). If None,
+                     the first usable of NVENC, QuickSync, VideoToolbox and
+                     libx264 is detected once per ffmpeg binary.
+            stream_copy: Opt-in: re-encode only the keyframe-aligned spans around
+                         B-roll insertions and stream-copy the rest of an H.264
+                         A-roll. Needs ffprobe and libx264; falls back to a full
+                         re-encode when the A-roll's profile, level, pixel format
+                         or frame rate cannot be reproduced.
+            threads: Encoder threads per ffmpeg process (0 = ffmpeg's default)
         """
         self.ffmpeg_path = ffmpeg_path or self._find_ffmpeg()
         if not self.ffmpeg_path:
             raise ValueError("ffmpeg not found. Please install ffmpeg and ensure it's in PATH.")
+        
+        self.encoder = encoder or _detect_encoder(self.ffmpeg_path)
+        self.stream_copy = stream_copy
+        self.threads = threads
+    
+    def _encoder_args(self) -> List[str]:
+        """Video codec arguments for the selected encoder."""
+        args = ["-c:v", self.encoder] + _ENCODER_ARGS.get(self.encoder, [])
+        if self.threads > 0:
+            args.extend(["-threads", str(self.threads)])
+        return args
     
     def _find_ffmpeg(self) -> Optional[str]:
-        """Find ffmpeg executable."""
+        """Find ffmpeg executable without spawning any processes."""
         # Check environment variable first
         ffmpeg_env = os.getenv("FFMPEG_PATH")
         if ffmpeg_env and os.path.exists(ffmpeg_env):
             return ffmpeg_env
         
-        # Try common paths
-        common_paths = [
-            "ffmpeg",
-            "/usr/bin/ffmpeg",
-            "/usr/local/bin/ffmpeg",
-            "C:\\ffmpeg\\bin\\ffmpeg.exe",
-            "C:\\Program Files\\ffmpeg\\bin\\ffmpeg.exe"
-        ]
+        # Search PATH (honours PATHEXT on Windows)
+        ffmpeg_on_path = shutil.which("ffmpeg")
+        if ffmpeg_on_path:
+            return ffmpeg_on_path
         
-        for path in common_paths:
-            try:
-                result = subprocess.run(
-                    [path, "-version"],
-                    capture_output=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    return path
-            except:
-                continue
+        # Try common install locations
+        for path in _COMMON_FFMPEG_PATHS:
+            if os.path.isfile(path) and os.access(path, os.X_OK):
+                return path
         
         return None
     
     def _validate_video_file(self, video_path: str) -> bool:
         """Validate that video file exists and is readable."""
-        if not os.path.exists(video_path):
+        try:
+            mtime = os.path.getmtime(video_path)
+        except OSError:
             return False
         
-        # Quick check with ffprobe
-        try:
-            ffprobe_path = self.ffmpeg_path.replace("ffmpeg", "ffprobe")
-            result = subprocess.run(
-                [ffprobe_path, "-v", "error", video_path],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except:
-            # If ffprobe fails, assume file is valid
-            return True
+        # Quick check with ffprobe, cached per file version
+        ffprobe_path = self.ffmpeg_path.replace("ffmpeg", "ffprobe")
+        return _probe_video_file(ffprobe_path, video_path, mtime)
+    
+    def _frame_size(self, video_path: str) -> Optional[Tuple[int, int]]:
+        """A-roll frame size used to pre-scale B-rolls, if it can be probed."""
+        ffprobe_path = self.ffmpeg_path.replace("ffmpeg", "ffprobe")
+        return _probe_frame_size(ffprobe_path, video_path, os.path.getmtime(video_path))
+    
+    def _overlay_filters(
+        self,
+        base_label: str,
+        broll_label: str,
+        index: int,
+        start_time: float,
+        end_time: float,
+        frame_size: Optional[Tuple[int, int]],
+        broll_filters: Optional[List[str]] = None
+    ) -> Tuple[List[str], str]:
+        """
+        Build the filters overlaying one B-roll onto the current video.
+        
+        The B-roll is scaled to the A-roll frame size once, up front, and
+        eof_action=pass hands back to the A-roll as soon as the B-roll runs
+        out instead of repeating its last frame.
+        
+        Args:
+            base_label: Label of the video being overlaid, e.g. '0:v'
+            broll_label: Label of the B-roll video stream, e.g. '1:v'
+            index: Unique index used to name the intermediate labels
+            start_time: Overlay start in seconds on the base timeline
+            end_time: Overlay end in seconds on the base timeline
+            frame_size: A-roll (width, height), or None to skip scaling
+            broll_filters: Filters applied to the B-roll before scaling
+            
+        Returns:
+            Tuple of (filters, output_label); labels are bare names and
+            only bracketed when written into a filter string
+        """
+        filters = []
+        output_label = f"v{index}"
+        
+        broll_chain = list(broll_filters or [])
+        if frame_size is not None:
+            width, height = frame_size
+            broll_chain.append(f"scale={width}:{height}:flags=fast_bilinear")
+        if broll_chain:
+            filters.append(f"[{broll_label}]{','.join(broll_chain)}[b{index}]")
+            broll_label = f"b{index}"
+        
+        # Enable overlay only during the specified time range
+        enable_expr = f"between(t,{start_time},{end_time})"
+        
+        filters.append(
+            f"[{base_label}][{broll_label}]overlay=0:0:"
+            f"eof_action=pass:shortest=0:repeatlast=0:"
+            f"enable='{enable_expr}'[{output_label}]"
+        )
+        return filters, output_label
     
     def _build_overlay_filters(
         self,
         timeline_segments: List[Dict[str, Any]],
-        broll_input_map: Dict[str, int]
+        broll_input_map: Dict[int, int],
+        frame_size: Optional[Tuple[int, int]] = None
     ) -> Tuple[str, List[str]]:
         """
         Build ffmpeg overlay filter complex for B-roll insertions.
         
         Args:
             timeline_segments: List of timeline segments
-            broll_input_map: Dictionary mapping broll_id to ffmpeg input index
+            broll_input_map: Dictionary mapping the position of each B-roll
+                             segment in timeline_segments to its ffmpeg input index
+            frame_size: A-roll (width, height) to scale B-rolls to, if known
             
         Returns:
             Tuple of (final_video_label, overlay_filters)
         """
-        base_input = "[0:v]"  # A-roll video
+        base_input = "0:v"  # A-roll video
         overlay_filters = []
         current_overlay = base_input
         
         # Track output label index
         output_index = 1
         
-        for segment in timeline_segments:
+        broll_fields = itemgetter("source", "start_time", "duration")
+        for position, segment in enumerate(timeline_segments):
             if segment["type"] == "b_roll":
-                broll_id = segment["source"]
-                start_time = segment["start_time"]
-                duration = segment["duration"]
+                broll_id, start_time, duration = broll_fields(segment)
                 
-                if broll_id not in broll_input_map:
+                # Get the input index for this B-roll
+                input_index = broll_input_map.get(position)
+                if input_index is None:
                     print(f"Warning: B-roll {broll_id} not found in input map, skipping...")
                     continue
                 
-                # Get the input index for this B-roll
-                input_index = broll_input_map[broll_id]
-                
                 # Build overlay filter
-                # Format: [previous][input_index:v]overlay=x:y:enable='between(t,start,end)'[output]
-                # We'll use fullscreen overlay (x=0:y=0)
-                output_label = f"[v{output_index}]"
-                
-                # Enable overlay only during the specified time range
-                enable_expr = f"between(t,{start_time},{start_time + duration})"
-                
-                overlay_filter = (
-                    f"{current_overlay}[{input_index}:v]overlay=0:0:"
-                    f"enable='{enable_expr}'{output_label}"
+                # Format: [input_index:v]setpts,scale[b];[previous][b]overlay=0:0:...[output]
+                # We'll use fullscreen overlay (x=0:y=0); the B-roll input starts at
+                # 0, so shift it onto the A-roll clock at the insertion point
+                filters, current_overlay = self._overlay_filters(
+                    current_overlay,
+                    f"{input_index}:v",
+                    output_index,
+                    start_time,
+                    start_time + duration,
+                    frame_size,
+                    [f"setpts=PTS-STARTPTS+{start_time}/TB"]
                 )
-                
-                overlay_filters.append(overlay_filter)
-                current_overlay = output_label
+                overlay_filters.extend(filters)
                 output_index += 1
         
         return current_overlay, overlay_filters
@@ -138,6 +396,9 @@ class VideoRenderer:
         """
         Build complete ffmpeg command for rendering.
         
+        Everything is rendered by one ffmpeg process: the A-roll is decoded
+        once and the B-rolls are overlaid onto it in a single filter graph.
+        
         Args:
             aroll_video_path: Path to A-roll video
             broll_paths: Dictionary mapping broll_id to video file path
@@ -151,40 +412,39 @@ class VideoRenderer:
         cmd = [self.ffmpeg_path]
         
         # Input files
-        # A-roll video (input 0)
+        # A-roll video (input 0), decoded on the GPU when encoding on one
+        if self.encoder != _DEFAULT_ENCODER:
+            cmd.extend(["-hwaccel", "auto"])
         cmd.extend(["-i", aroll_video_path])
         
-        # B-roll videos (inputs 1, 2, 3, ...)
-        broll_segments = [s for s in timeline_segments if s["type"] == "b_roll"]
-        used_brolls = set()
-        broll_inputs = []
-        
-        for segment in broll_segments:
-            broll_id = segment["source"]
-            if broll_id in broll_paths and broll_id not in used_brolls:
-                cmd.extend(["-i", broll_paths[broll_id]])
-                broll_inputs.append(broll_id)
-                used_brolls.add(broll_id)
-        
-        # Build B-roll input index map
-        # Input 0 = A-roll, Input 1+ = B-rolls
+        # B-roll videos (inputs 1, 2, 3, ...), one per insertion; -t limits
+        # reading and decoding to the part of the clip the insertion shows.
+        # A clip used twice is opened twice rather than split: a split
+        # branch would hold decoded frames until its later insertion point.
         broll_input_map = {}
         input_index = 1
-        for broll_id in broll_inputs:
-            broll_input_map[broll_id] = input_index
-            input_index += 1
+        for position, segment in enumerate(timeline_segments):
+            broll_path = broll_paths.get(segment["source"]) if segment["type"] == "b_roll" else None
+            if broll_path is not None:
+                cmd.extend([
+                    "-t", f"{segment['duration']:.6f}",
+                    "-i", broll_path
+                ])
+                broll_input_map[position] = input_index
+                input_index += 1
         
         # Build overlay filter complex
         final_video_label, overlay_filters = self._build_overlay_filters(
             timeline_segments,
-            broll_input_map
+            broll_input_map,
+            self._frame_size(aroll_video_path) if broll_input_map else None
         )
         
         # If no overlays, just copy video
         if not overlay_filters:
             # Simple copy: use A-roll video as-is
+            cmd.extend(self._encoder_args())
             cmd.extend([
-                "-c:v", "libx264",
                 "-c:a", "copy",  # Copy audio without re-encoding
                 "-map", "0:v:0",  # Map A-roll video
                 "-map", "0:a:0",  # Map A-roll audio
@@ -199,11 +459,9 @@ class VideoRenderer:
         
         cmd.extend([
             "-filter_complex", filter_complex,
-            "-map", final_video_label.replace("[", "").replace("]", ""),  # Remove brackets
+            "-map", f"[{final_video_label}]",  # Filter graph output
             "-map", "0:a:0",  # Map A-roll audio
-            "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "23",
+            *self._encoder_args(),
             "-c:a", "copy",  # Copy audio without re-encoding
             "-y",  # Overwrite output
             output_path
@@ -211,12 +469,287 @@ class VideoRenderer:
         
         return cmd
     
+    def _plan_stream_copy(
+        self,
+        aroll_video_path: str,
+        broll_segments: List[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Split the A-roll into stream-copied and re-encoded chunks.
+        
+        Each B-roll insertion is widened to the surrounding A-roll keyframes
+        so that every chunk boundary is a keyframe and the untouched spans
+        can be copied without re-encoding.
+        
+        Args:
+            aroll_video_path: Path to A-roll video
+            broll_segments: B-roll timeline segments
+            
+        Returns:
+            Ordered list of chunks with start, end (None = end of video),
+            copy flag and the B-roll segments they contain (re-encoded chunks
+            also carry the encoder arguments matching the A-roll), or None if
+            the A-roll cannot be stream-copied
+        """
+        # Only libx264 exposes every parameter that has to be matched
+        if self.encoder != "libx264":
+            return None
+        
+        ffprobe_path = self.ffmpeg_path.replace("ffmpeg", "ffprobe")
+        probe = _probe_keyframes(
+            ffprobe_path, aroll_video_path, os.path.getmtime(aroll_video_path)
+        )
+        if probe is None:
+            return None
+        params = dict(probe[0])
+        keyframes = probe[1]
+        
+        # Re-encoded chunks are spliced with copied ones under the A-roll's
+        # sample description, so their H.264 parameters must be identical
+        profile = _X264_PROFILES.get(params.get("profile"))
+        try:
+            level = int(params["level"])
+            timescale = int(params["time_base"].split("/")[1])
+        except (KeyError, IndexError, ValueError):
+            return None
+        if (
+            params.get("codec_name") != "h264"
+            or profile is None
+            or level <= 0
+            or not params.get("pix_fmt")
+            or params.get("r_frame_rate", "0/0").endswith("/0")
+        ):
+            return None
+        encode_args = [
+            "-profile:v", profile,
+            "-level:v", f"{level / 10:.1f}",
+            "-pix_fmt", params["pix_fmt"],
+            "-r", params["r_frame_rate"],
+            "-video_track_timescale", str(timescale)
+        ]
+        
+        # Keyframe-aligned re-encode windows, merged where they overlap
+        windows = []
+        for segment in sorted(broll_segments, key=lambda s: s["start_time"]):
+            start_time = segment["start_time"]
+            end_time = start_time + segment["duration"]
+            if end_time <= start_time:
+                continue
+            
+            i = bisect_right(keyframes, start_time) - 1
+            window_start = keyframes[i] if i >= 0 else 0.0
+            j = bisect_left(keyframes, end_time)
+            window_end = keyframes[j] if j < len(keyframes) else None
+            
+            if windows and (windows[-1]["end"] is None or window_start <= windows[-1]["end"]):
+                last = windows[-1]
+                if last["end"] is not None:
+                    last["end"] = None if window_end is None else max(last["end"], window_end)
+                last["brolls"].append(segment)
+            else:
+                windows.append({
+                    "start": window_start,
+                    "end": window_end,
+                    "copy": False,
+                    "brolls": [segment],
+                    "encode_args": encode_args
+                })
+        
+        # Fill the gaps between windows with copied chunks
+        chunks = []
+        position = 0.0
+        for window in windows:
+            if window["start"] > position:
+                chunks.append({"start": position, "end": window["start"], "copy": True, "brolls": []})
+            chunks.append(window)
+            position = window["end"]
+        if position is not None:
+            chunks.append({"start": position, "end": None, "copy": True, "brolls": []})
+        
+        return chunks
+    
+    def _build_insert_command(
+        self,
+        aroll_video_path: str,
+        broll_paths: Dict[str, str],
+        chunk: Dict[str, Any],
+        chunk_path: str
+    ) -> List[str]:
+        """
+        Build the ffmpeg command re-encoding one chunk with its B-roll overlays.
+        
+        Args:
+            aroll_video_path: Path to A-roll video
+            broll_paths: Dictionary mapping broll_id to video file path
+            chunk: Re-encoded chunk from _plan_stream_copy
+            chunk_path: Output path of the video-only chunk
+            
+        Returns:
+            List of command arguments
+        """
+        start = chunk["start"]
+        duration = [] if chunk["end"] is None else ["-t", f"{chunk['end'] - start:.6f}"]
+        cmd = [self.ffmpeg_path, "-ss", f"{start:.6f}", *duration, "-i", aroll_video_path]
+        
+        # Chunk timestamps start at 0; each B-roll plays from its own start
+        frame_size = self._frame_size(aroll_video_path)
+        filters = []
+        current = "0:v"
+        for index, segment in enumerate(chunk["brolls"], 1):
+            cmd.extend([
+                "-t", f"{segment['duration']:.6f}",
+                "-i", broll_paths[segment["source"]]
+            ])
+            offset = segment["start_time"] - start
+            overlay, current = self._overlay_filters(
+                current,
+                f"{index}:v",
+                index,
+                round(offset, 6),
+                round(offset + segment["duration"], 6),
+                frame_size,
+                [f"setpts=PTS-STARTPTS+{offset:.6f}/TB"]
+            )
+            filters.extend(overlay)
+        
+        cmd.extend([
+            "-filter_complex", ";".join(filters),
+            "-map", f"[{current}]",
+            "-an",
+            *self._encoder_args(),
+            *chunk["encode_args"],
+            "-y", chunk_path
+        ])
+        return cmd
+    
+    def _render_stream_copy(
+        self,
+        aroll_video_path: str,
+        broll_paths: Dict[str, str],
+        chunks: List[Dict[str, Any]],
+        output_path: str,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> None:
+        """
+        Render chunk by chunk, then concatenate with the A-roll audio.
+        
+        The A-roll video is split at the chunk boundaries in one stream-copy
+        pass; only the chunks containing B-roll are then re-encoded.
+        
+        Args:
+            aroll_video_path: Path to A-roll video
+            broll_paths: Dictionary mapping broll_id to video file path
+            chunks: Chunks from _plan_stream_copy
+            output_path: Output video path
+            progress_callback: Called with progress of each ffmpeg step
+        """
+        encoded = sum(1 for chunk in chunks if not chunk["copy"])
+        print(f"Rendering {len(chunks)} chunks ({encoded} re-encoded, rest stream-copied)...")
+        
+        with tempfile.TemporaryDirectory(prefix="broll_render_") as work_dir:
+            # Boundaries are keyframes; split just below each one so
+            # timestamp rounding cannot push the cut to the next keyframe
+            split_cmd = [
+                self.ffmpeg_path, "-i", aroll_video_path,
+                "-map", "0:v:0", "-c", "copy"
+            ]
+            if len(chunks) > 1:
+                split_times = ",".join(f"{chunk['start'] - 0.001:.6f}" for chunk in chunks[1:])
+                split_cmd.extend([
+                    "-f", "segment", "-segment_times", split_times, "-reset_timestamps", "1",
+                    "-y", os.path.join(work_dir, "part_%04d.mp4")
+                ])
+            else:
+                split_cmd.extend(["-y", os.path.join(work_dir, "part_0000.mp4")])
+            self._run_ffmpeg(split_cmd, progress_callback)
+            
+            chunk_paths = []
+            for index, chunk in enumerate(chunks):
+                if chunk["copy"]:
+                    chunk_path = os.path.join(work_dir, f"part_{index:04d}.mp4")
+                else:
+                    chunk_path = os.path.join(work_dir, f"insert_{index:04d}.mp4")
+                    self._run_ffmpeg(
+                        self._build_insert_command(aroll_video_path, broll_paths, chunk, chunk_path),
+                        progress_callback
+                    )
+                chunk_paths.append(chunk_path)
+            
+            list_path = os.path.join(work_dir, "chunks.txt")
+            with open(list_path, 'w', encoding='utf-8') as f:
+                f.writelines(f"file '{path}'\n" for path in chunk_paths)
+            
+            # Concatenate video chunks and copy the untouched A-roll audio
+            self._run_ffmpeg([
+                self.ffmpeg_path,
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-i", aroll_video_path,
+                "-map", "0:v:0",
+                "-map", "1:a:0",
+                "-c", "copy",
+                "-y", output_path
+            ], progress_callback)
+    
+    def _run_ffmpeg(
+        self,
+        cmd: List[str],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> None:
+        """
+        Run an ffmpeg command, streaming its progress.
+        
+        Progress is read from '-progress pipe:1' as it is produced, and only
+        the last FFMPEG_STDERR_TAIL_LINES lines of stderr are kept, so long
+        renders do not buffer their whole log in memory.
+        
+        Args:
+            cmd: ffmpeg command arguments
+            progress_callback: Called with each key=value progress block
+            
+        Raises:
+            RuntimeError: If ffmpeg exits with an error
+        """
+        cmd = [cmd[0], "-nostats", "-progress", "pipe:1", *cmd[1:]]
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        
+        # Drain stderr on a separate thread so neither pipe can fill up
+        stderr_tail = deque(maxlen=FFMPEG_STDERR_TAIL_LINES)
+        stderr_reader = threading.Thread(
+            target=stderr_tail.extend, args=(process.stderr,), daemon=True
+        )
+        stderr_reader.start()
+        
+        progress = {}
+        for line in process.stdout:
+            key, _, value = line.strip().partition("=")
+            progress[key] = value
+            # Each block ends with progress=continue or progress=end
+            if key == "progress":
+                if progress_callback is not None:
+                    progress_callback(progress)
+                progress = {}
+        
+        returncode = process.wait()
+        stderr_reader.join()
+        
+        if returncode != 0:
+            error_msg = f"FFmpeg error: {''.join(stderr_tail)}"
+            print(f"✗ {error_msg}")
+            raise RuntimeError(error_msg)
+    
     def render(
         self,
         timeline: Dict[str, Any],
         aroll_video_path: str,
         broll_paths: Dict[str, str],
-        output_path: str = None
+        output_path: str = None,
+        progress_callback: Optional[ProgressCallback] = None
     ) -> str:
         """
         Render video from timeline plan.
@@ -226,6 +759,8 @@ class VideoRenderer:
             aroll_video_path: Path to A-roll video file
             broll_paths: Dictionary mapping broll_id to video file path
             output_path: Output video path (optional, auto-generated if None)
+            progress_callback: Optional callable receiving ffmpeg progress
+                               blocks (e.g. 'frame', 'out_time_ms') per step
             
         Returns:
             Path to rendered video file
@@ -253,6 +788,18 @@ class VideoRenderer:
             aroll_file = Path(aroll_video_path)
             output_path = str(aroll_file.parent / f"{aroll_file.stem}_rendered.mp4")
         
+        # Re-encode only around insertions when the A-roll allows it
+        chunks = None
+        if self.stream_copy:
+            chunks = self._plan_stream_copy(aroll_video_path, broll_segments)
+        
+        if chunks is not None:
+            self._render_stream_copy(
+                aroll_video_path, broll_paths, chunks, output_path, progress_callback
+            )
+            print(f"✓ Video rendered successfully: {output_path}")
+            return output_path
+        
         # Build ffmpeg command
         cmd = self._build_ffmpeg_command(
             aroll_video_path,
@@ -265,20 +812,68 @@ class VideoRenderer:
         print(f"Rendering video with ffmpeg...")
         print(f"Command: {' '.join(cmd)}")
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            print(f"✓ Video rendered successfully: {output_path}")
-            return output_path
+        self._run_ffmpeg(cmd, progress_callback)
+        print(f"✓ Video rendered successfully: {output_path}")
+        return output_path
+    
+    def render_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        max_parallel: int = None
+    ) -> List[Any]:
+        """
+        Render several timelines with concurrent ffmpeg processes.
         
-        except subprocess.CalledProcessError as e:
-            error_msg = f"FFmpeg error: {e.stderr}"
-            print(f"✗ {error_msg}")
-            raise RuntimeError(error_msg)
+        A few single-purpose ffmpeg processes keep the CPU busier than one
+        multi-threaded ffmpeg, which idles on cheap segments. The cores are
+        split evenly between the processes, and NVENC renders are capped at
+        the driver's session limit.
+        
+        Args:
+            jobs: Keyword arguments for render() per job (timeline,
+                  aroll_video_path, broll_paths, output_path)
+            max_parallel: Maximum concurrent ffmpeg processes. Defaults to a
+                          quarter of the cores (at least 1), or
+                          NVENC_MAX_SESSIONS when encoding with NVENC.
+            
+        Returns:
+            Output path or raised exception per job, in the order of jobs
+        """
+        if not jobs:
+            return []
+        
+        cores = os.cpu_count() or 1
+        if max_parallel is None:
+            max_parallel = NVENC_MAX_SESSIONS if self.encoder == "h264_nvenc" else max(1, cores // 4)
+        max_parallel = min(max_parallel, len(jobs))
+        
+        renderer = VideoRenderer(
+            self.ffmpeg_path,
+            self.encoder,
+            self.stream_copy,
+            threads=self.threads or -(-cores // max_parallel)
+        )
+        
+        def render_job(job: Dict[str, Any]) -> Any:
+            try:
+                return renderer.render(**job)
+            except RuntimeError as e:
+                if renderer.encoder != "h264_nvenc":
+                    return e
+                # Out of GPU memory or encode sessions: retry on the CPU
+                print(f"NVENC render failed, retrying with {_DEFAULT_ENCODER}...")
+                fallback = VideoRenderer(
+                    self.ffmpeg_path, _DEFAULT_ENCODER, self.stream_copy, renderer.threads
+                )
+                try:
+                    return fallback.render(**job)
+                except Exception as fallback_error:
+                    return fallback_error
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            return list(executor.map(render_job, jobs))
     
     def render_from_files(
         self,
@@ -299,8 +894,8 @@ class VideoRenderer:
         Returns:
             Path to rendered video file
         """
-        with open(timeline_path, 'r', encoding='utf-8') as f:
-            timeline = json.load(f)
+        with open(timeline_path, 'rb') as f:
+            timeline = orjson.loads(f.read())
         
         return self.render(timeline, aroll_video_path, broll_paths, output_path)
     
@@ -323,21 +918,10 @@ class VideoRenderer:
         Returns:
             FFmpeg command as string
         """
-        timeline_segments = timeline.get("segments", [])
-        broll_segments = [s for s in timeline_segments if s["type"] == "b_roll"]
-        used_brolls = set()
-        broll_inputs = []
-        
-        for segment in broll_segments:
-            broll_id = segment["source"]
-            if broll_id in broll_paths and broll_id not in used_brolls:
-                broll_inputs.append(broll_id)
-                used_brolls.add(broll_id)
-        
         cmd = self._build_ffmpeg_command(
             aroll_video_path,
             broll_paths,
-            timeline_segments,
+            timeline.get("segments", []),
             output_path
         )
         
@@ -379,8 +963,8 @@ def main():
         renderer = VideoRenderer()
         
         # Get command string for example
-        with open(timeline_path, 'r') as f:
-            timeline = json.load(f)
+        with open(timeline_path, 'rb') as f:
+            timeline = orjson.loads(f.read())
         
         cmd_string = renderer.get_ffmpeg_command_string(
             timeline,
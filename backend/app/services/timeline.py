@@ -5,24 +5,98 @@ Combines A-roll transcript segments and B-roll insertions into
 a single structured timeline JSON.
 """
 
-import json
 import uuid
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from bisect import bisect_left
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
+import numpy as np
+import orjson
+
+try:
+    from numba import njit  # Optional JIT for the statistics reduction
+except ImportError:
+    njit = None
+
+
+# Segment type codes for the statistics kernel
+_SEGMENT_TYPE_CODES = {"a_roll": 0, "b_roll": 1}
+
+
+def _sum_durations(durations, type_codes):
+    """
+    Accumulate timeline durations and counts per segment type.
+    
+    Written as a plain loop over flat arrays so it can be compiled by
+    Numba when installed.
+    
+    Args:
+        durations: Duration of each timeline segment
+        type_codes: Type code of each segment (0 A-roll, 1 B-roll, -1 other)
+        
+    Returns:
+        Tuple of (aroll_duration, broll_duration, aroll_count, broll_count)
+    """
+    aroll_duration = 0.0
+    broll_duration = 0.0
+    aroll_count = 0
+    broll_count = 0
+    
+    for i in range(len(durations)):
+        duration = durations[i]
+        
+        if type_codes[i] == 0:
+            aroll_duration += duration
+            aroll_count += 1
+        elif type_codes[i] == 1:
+            broll_duration += duration
+            broll_count += 1
+    
+    return aroll_duration, broll_duration, aroll_count, broll_count
+
+
+_sum_durations_jit = njit(cache=True)(_sum_durations) if njit is not None else None
+
+
+def _segment_index(aroll_segments: List[Dict[str, Any]]) -> Tuple[list, list, list, dict]:
+    """
+    Build the range and matching lookups for one transcript.
+    
+    Args:
+        aroll_segments: List of A-roll transcript segments
+        
+    Returns:
+        Tuple of (starts, ends, starts_cs, start_index): segment start and
+        end times, starts in integer centiseconds, and segment positions
+        bucketed by tenth of a second
+    """
+    starts = list(map(itemgetter("start_time"), aroll_segments))
+    ends = list(map(itemgetter("end_time"), aroll_segments))
+    
+    # A start within 0.1s (10cs) of an insertion lands in the same or an
+    # adjacent bucket
+    starts_cs = np.rint(np.array(starts, dtype=np.float64) * 100).astype(np.int64).tolist()
+    start_index = {}
+    for i, start_cs in enumerate(starts_cs):
+        start_index.setdefault(start_cs // 10, []).append(i)
+    
+    return starts, ends, starts_cs, start_index
 
 
 class TimelinePlanner:
     """Plans timeline by combining A-roll segments and B-roll insertions."""
     
-    def __init__(self, aroll_video_path: str = None):
+    def __init__(self, aroll_video_path: str = None, debug: bool = False):
         """
         Initialize the timeline planner.
         
         Args:
             aroll_video_path: Path to the A-roll video file (optional, for metadata)
+            debug: Include the per-segment debug_info block in timelines
         """
         self.aroll_video_path = aroll_video_path
+        self.debug = debug
     
     def _create_timeline_segments(
         self,
@@ -39,117 +113,136 @@ class TimelinePlanner:
         Returns:
             List of timeline segments in chronological order
         """
-        timeline_segments = []
-        
-        # Create a sorted list of insertion points
-        insertions = sorted(broll_matches, key=lambda x: x["start_sec"])
-        
         # Get total A-roll duration
         if not aroll_segments:
             return []
         
         total_aroll_duration = aroll_segments[-1]["end_time"]
+        
+        # If no insertions, return full A-roll
+        if not broll_matches:
+            return [{
+                "type": "a_roll",
+                "start_time": 0.0,
+                "end_time": round(total_aroll_duration, 2),
+                "duration": round(total_aroll_duration, 2),
+                "source": "a_roll_video",
+                "transcript": " ".join(seg["text"] for seg in aroll_segments)
+            }]
+        
         current_time = 0.0
         
+        # Segment boundaries (chronological) and start-time index
+        starts, ends, starts_cs, start_index = _segment_index(aroll_segments)
+        
+        # Insertion times as flat arrays, ordered chronologically (stable,
+        # so matches starting together keep their input order); the string
+        # fields stay on the match dicts, reached through the order
+        count = len(broll_matches)
+        ins_starts = np.fromiter(map(itemgetter("start_sec"), broll_matches), dtype=np.float64, count=count)
+        ins_durations = np.fromiter(map(itemgetter("duration_sec"), broll_matches), dtype=np.float64, count=count)
+        if np.all(ins_starts[:-1] <= ins_starts[1:]):
+            # The matcher already returns matches in start order
+            order = range(count)
+        else:
+            order = np.argsort(ins_starts, kind="stable")
+            ins_starts = ins_starts[order]
+            ins_durations = ins_durations[order]
+        ins_ends = ins_starts + ins_durations
+        ins_starts_cs = np.rint(ins_starts * 100).astype(np.int64).tolist()
+        
+        # Round every insertion's times in one vectorized pass: its start,
+        # end and duration, and the start/duration of the A-roll gap before it
+        gap_starts = np.concatenate(([0.0], ins_ends))[:-1]
+        starts_r, ends_r, durations_r, gap_starts_r, gap_durations_r = np.round(
+            np.stack((ins_starts, ins_ends, ins_durations, gap_starts, ins_starts - gap_starts)), 2
+        ).tolist()
+        
+        # Gaps are visited in chronological order, so one cursor sweeps the
+        # segments; it only moves past segments that end before a gap starts
+        cursor = 0
+        
+        def transcript_for_gap(start_time: float, end_time: float) -> str:
+            nonlocal cursor
+            if cursor and ends[cursor - 1] >= start_time:
+                # Overlapping insertions can step back in time: rewind
+                cursor = bisect_left(ends, start_time)
+            while cursor < len(ends) and ends[cursor] < start_time:
+                cursor += 1
+            
+            texts = []
+            j = cursor
+            while j < len(starts) and starts[j] <= end_time:
+                texts.append(aroll_segments[j]["text"])
+                j += 1
+            return " ".join(texts)
+        
+        # Each insertion adds at most a gap and a B-roll segment, plus the
+        # A-roll tail; fill a preallocated list and trim it afterwards
+        timeline_segments = [None] * (2 * count + 1)
+        idx = 0
+        
         # Process timeline chronologically
-        for insertion in insertions:
-            insertion_start = insertion["start_sec"]
-            insertion_duration = insertion["duration_sec"]
+        for k, (insertion_start, insertion_end) in enumerate(zip(ins_starts.tolist(), ins_ends.tolist())):
+            insertion = broll_matches[order[k]]
             
             # Add A-roll segment before insertion (if any)
             if current_time < insertion_start:
-                timeline_segments.append({
+                timeline_segments[idx] = {
                     "type": "a_roll",
-                    "start_time": round(current_time, 2),
-                    "end_time": round(insertion_start, 2),
-                    "duration": round(insertion_start - current_time, 2),
+                    "start_time": gap_starts_r[k],
+                    "end_time": starts_r[k],
+                    "duration": gap_durations_r[k],
                     "source": "a_roll_video",
-                    "transcript": self._get_transcript_for_range(
-                        aroll_segments, current_time, insertion_start
-                    )
-                })
+                    "transcript": transcript_for_gap(current_time, insertion_start)
+                }
+                idx += 1
             
             # Find the matching A-roll segment for this insertion
-            matching_segment = None
-            for seg in aroll_segments:
-                if abs(seg["start_time"] - insertion_start) < 0.1:  # Allow small tolerance
-                    matching_segment = seg
-                    break
+            insertion_cs = ins_starts_cs[k]
+            key = insertion_cs // 10
+            candidates = [
+                i
+                for bucket in (key - 1, key, key + 1)
+                for i in start_index.get(bucket, ())
+                if abs(starts_cs[i] - insertion_cs) < 10  # Allow small tolerance
+            ]
+            matching_segment = aroll_segments[min(candidates)] if candidates else None
             
             # Add B-roll insertion
-            timeline_segments.append({
+            timeline_segments[idx] = {
                 "type": "b_roll",
-                "start_time": round(insertion_start, 2),
-                "end_time": round(insertion_start + insertion_duration, 2),
-                "duration": round(insertion_duration, 2),
+                "start_time": starts_r[k],
+                "end_time": ends_r[k],
+                "duration": durations_r[k],
                 "source": insertion["broll_id"],
                 "insertion_reason": insertion["reason"],
                 "confidence": insertion["confidence"],
                 "matching_segment": {
-                    "text": matching_segment["text"] if matching_segment else "",
-                    "start_time": matching_segment["start_time"] if matching_segment else insertion_start,
-                    "end_time": matching_segment["end_time"] if matching_segment else insertion_start + insertion_duration
+                    "text": matching_segment["text"],
+                    "start_time": matching_segment["start_time"],
+                    "end_time": matching_segment["end_time"]
                 } if matching_segment else None
-            })
+            }
+            idx += 1
             
-            current_time = insertion_start + insertion_duration
+            current_time = insertion_end
         
         # Add remaining A-roll content after last insertion
         if current_time < total_aroll_duration:
-            timeline_segments.append({
+            timeline_segments[idx] = {
                 "type": "a_roll",
                 "start_time": round(current_time, 2),
                 "end_time": round(total_aroll_duration, 2),
                 "duration": round(total_aroll_duration - current_time, 2),
                 "source": "a_roll_video",
-                "transcript": self._get_transcript_for_range(
-                    aroll_segments, current_time, total_aroll_duration
-                )
-            })
-        
-        # If no insertions, return full A-roll
-        if not insertions:
-            timeline_segments.append({
-                "type": "a_roll",
-                "start_time": 0.0,
-                "end_time": round(total_aroll_duration, 2),
-                "duration": round(total_aroll_duration, 2),
-                "source": "a_roll_video",
-                "transcript": self._get_transcript_for_range(
-                    aroll_segments, 0.0, total_aroll_duration
-                )
-            })
+                "transcript": transcript_for_gap(current_time, total_aroll_duration)
+            }
+            idx += 1
         
+        del timeline_segments[idx:]
         return timeline_segments
     
-    def _get_transcript_for_range(
-        self,
-        segments: List[Dict[str, Any]],
-        start_time: float,
-        end_time: float
-    ) -> str:
-        """
-        Get transcript text for a time range.
-        
-        Args:
-            segments: List of transcript segments
-            start_time: Start time of range
-            end_time: End time of range
-            
-        Returns:
-            Combined transcript text for the range
-        """
-        relevant_segments = []
-        for seg in segments:
-            seg_start = seg["start_time"]
-            seg_end = seg["end_time"]
-            
-            # Check if segment overlaps with range
-            if not (seg_end < start_time or seg_start > end_time):
-                relevant_segments.append(seg["text"])
-        
-        return " ".join(relevant_segments)
-    
     def _calculate_statistics(
         self,
         timeline_segments: List[Dict[str, Any]],
@@ -167,22 +260,21 @@ class TimelinePlanner:
         Returns:
             Statistics dictionary
         """
-        total_duration = 0.0
-        aroll_duration = 0.0
-        broll_duration = 0.0
-        aroll_count = 0
-        broll_count = 0
-        
-        for seg in timeline_segments:
-            duration = seg.get("duration", 0.0)
-            total_duration += duration
-            
-            if seg["type"] == "a_roll":
-                aroll_duration += duration
-                aroll_count += 1
-            elif seg["type"] == "b_roll":
-                broll_duration += duration
-                broll_count += 1
+        durations = [seg.get("duration", 0.0) for seg in timeline_segments]
+        type_codes = [_SEGMENT_TYPE_CODES.get(seg["type"], -1) for seg in timeline_segments]
+        
+        if _sum_durations_jit is not None:
+            totals = _sum_durations_jit(
+                np.array(durations, dtype=np.float64),
+                np.array(type_codes, dtype=np.int8)
+            )
+        else:
+            totals = _sum_durations(durations, type_codes)
+        aroll_duration, broll_duration, aroll_count, broll_count = totals
+        
+        # Segments are laid end to end from 0, so the timeline's length is
+        # where its last segment ends
+        total_duration = timeline_segments[-1]["end_time"] if timeline_segments else 0.0
         
         # Calculate original A-roll duration
         original_aroll_duration = 0.0
@@ -236,12 +328,16 @@ class TimelinePlanner:
         # Build complete timeline
         timeline = {
             "timeline_id": str(uuid.uuid4()),
-            "created_at": datetime.utcnow().isoformat() + "Z",
+            "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
             "source_video": video_path or "a_roll_video.mp4",
             "total_duration": stats["total_duration"],
             "segments": timeline_segments,
-            "statistics": stats,
-            "debug_info": {
+            "statistics": stats
+        }
+        
+        # Per-segment echo of the inputs, only built when debugging
+        if self.debug:
+            timeline["debug_info"] = {
                 "original_aroll_segments": len(aroll_segments),
                 "broll_matches_found": len(broll_matches),
                 "timeline_segments_created": len(timeline_segments),
@@ -263,7 +359,6 @@ class TimelinePlanner:
                     for match in broll_matches
                 ]
             }
-        }
         
         return timeline
     
@@ -285,13 +380,13 @@ class TimelinePlanner:
             Complete timeline dictionary
         """
         # Load A-roll transcript
-        with open(aroll_transcript_path, 'r', encoding='utf-8') as f:
-            aroll_data = json.load(f)
+        with open(aroll_transcript_path, 'rb') as f:
+            aroll_data = orjson.loads(f.read())
             aroll_segments = aroll_data.get("segments", [])
         
         # Load B-roll matches
-        with open(broll_matches_path, 'r', encoding='utf-8') as f:
-            matches_data = json.load(f)
+        with open(broll_matches_path, 'rb') as f:
+            matches_data = orjson.loads(f.read())
             broll_matches = matches_data.get("matches", [])
         
         return self.create_timeline(aroll_segments, broll_matches, aroll_video_path)
@@ -311,8 +406,8 @@ class TimelinePlanner:
         Returns:
             Path to saved file
         """
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(timeline, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(timeline, option=orjson.OPT_INDENT_2))
         
         return output_path
     
@@ -342,14 +437,15 @@ class TimelinePlanner:
         
         print(f"\nTimeline Segments ({len(timeline['segments'])}):")
         print("-" * 80)
+        segment_fields = itemgetter('type', 'start_time', 'end_time', 'duration')
         for i, seg in enumerate(timeline['segments'], 1):
-            seg_type = "A-ROLL" if seg['type'] == 'a_roll' else "B-ROLL"
-            print(f"{i}. [{seg_type}] {seg['start_time']:.2f}s - {seg['end_time']:.2f}s ({seg['duration']:.2f}s)")
+            seg_type, start_time, end_time, duration = segment_fields(seg)
+            print(f"{i}. [{'A-ROLL' if seg_type == 'a_roll' else 'B-ROLL'}] {start_time:.2f}s - {end_time:.2f}s ({duration:.2f}s)")
             
-            if seg['type'] == 'a_roll' and 'transcript' in seg:
+            if seg_type == 'a_roll' and 'transcript' in seg:
                 transcript_preview = seg['transcript'][:60] + "..." if len(seg['transcript']) > 60 else seg['transcript']
                 print(f"   Transcript: {transcript_preview}")
-            elif seg['type'] == 'b_roll':
+            elif seg_type == 'b_roll':
                 print(f"   B-roll: {seg['source']}")
                 print(f"   Reason: {seg.get('insertion_reason', 'N/A')}")
                 print(f"   Confidence: {seg.get('confidence', 0.0):.3f}")
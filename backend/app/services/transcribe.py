@@ -6,32 +6,104 @@ sentence-level timestamped segments.
 """
 
 import os
-import json
-from typing import List, Dict, Any
+import re
+import mimetypes
+import shutil
+import subprocess
+import tempfile
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Any, Tuple
 from pathlib import Path
-import openai
-from moviepy.editor import VideoFileClip
+import orjson
+
+if TYPE_CHECKING:
+    import openai
+
+
+# Target length of the audio chunks transcribed in parallel; audio no
+# longer than this is sent in a single request
+TRANSCRIBE_CHUNK_SECONDS = 60.0
+
+# Maximum number of Whisper requests in flight for one video
+TRANSCRIBE_MAX_CONCURRENCY = 4
+
+# Silence detection used to place chunk cuts between words
+SILENCE_NOISE_LEVEL = "-30dB"
+SILENCE_MIN_DURATION = 0.5
+
+_DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_SILENCE_PATTERN = re.compile(r"silence_(start|end): (-?\d+(?:\.\d+)?)")
+
+
+@lru_cache(maxsize=4)
+def _get_client(api_key: str) -> "openai.OpenAI":
+    """Shared OpenAI client (and connection pool) per API key."""
+    # Imported on first use so importing this module stays cheap
+    import openai
+    
+    return openai.OpenAI(api_key=api_key)
+
+
+def _chunk_boundaries(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    chunk_seconds: float
+) -> List[float]:
+    """
+    Choose cut points splitting audio into chunks of about chunk_seconds.
+    
+    Each cut is placed in the middle of the latest silence that keeps the
+    chunk between half and the full target length, or at the target
+    length when there is no such silence.
+    
+    Args:
+        duration: Audio duration in seconds
+        silences: (start, end) of detected silences, in order
+        chunk_seconds: Target chunk length in seconds
+        
+    Returns:
+        Cut times in seconds, ascending (empty for a single chunk)
+    """
+    midpoints = [(start + end) / 2 for start, end in silences]
+    cuts = []
+    last_cut = 0.0
+    
+    while duration - last_cut > chunk_seconds:
+        target = last_cut + chunk_seconds
+        i = bisect_right(midpoints, target) - 1
+        if i >= 0 and midpoints[i] >= last_cut + chunk_seconds / 2:
+            last_cut = midpoints[i]
+        else:
+            last_cut = target
+        cuts.append(last_cut)
+    
+    return cuts
 
 
 class ArollTranscriber:
     """Handles transcription of A-roll videos using OpenAI Whisper API."""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, ffmpeg_path: str = None):
         """
         Initialize the transcriber.
         
         Args:
             api_key: OpenAI API key. If None, reads from OPENAI_API_KEY env var.
+            ffmpeg_path: Path to ffmpeg executable. If None, uses FFMPEG_PATH
+                         or 'ffmpeg' from PATH.
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable.")
         
-        self.client = openai.OpenAI(api_key=self.api_key)
+        self.client = _get_client(self.api_key)
+        self.ffmpeg_path = ffmpeg_path or os.getenv("FFMPEG_PATH") or shutil.which("ffmpeg") or "ffmpeg"
     
     def extract_audio(self, video_path: str, output_audio_path: str = None) -> str:
         """
-        Extract audio from video file.
+        Extract audio from video file as 16 kHz mono Opus (.ogg).
         
         Args:
             video_path: Path to the input video file
@@ -42,48 +114,200 @@ class ArollTranscriber:
         """
         if output_audio_path is None:
             video_file = Path(video_path)
-            output_audio_path = str(video_file.parent / f"{video_file.stem}_audio.mp3")
+            output_audio_path = str(video_file.parent / f"{video_file.stem}_audio.ogg")
         
-        # Extract audio using moviepy
-        video = VideoFileClip(video_path)
-        audio = video.audio
-        audio.write_audiofile(output_audio_path, verbose=False, logger=None)
-        audio.close()
-        video.close()
+        # Extract audio with a single ffmpeg process; Whisper works at
+        # 16 kHz mono, and low-bitrate Opus keeps speech intelligible at a
+        # fraction of the MP3 upload size
+        cmd = [
+            self.ffmpeg_path, "-y", "-hide_banner", "-v", "error",
+            "-i", video_path,
+            "-vn", "-ac", "1", "-ar", "16000",
+            "-c:a", "libopus", "-b:a", "24k",
+            "-f", "ogg", output_audio_path
+        ]
+        result = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Audio extraction failed: {result.stderr.strip()}")
         
         return output_audio_path
     
     def transcribe_with_timestamps(
         self, 
         audio_path: str,
-        response_format: str = "verbose_json"
+        response_format: str = "verbose_json",
+        word_timestamps: bool = False
     ) -> Dict[str, Any]:
         """
         Transcribe audio using OpenAI Whisper API with timestamps.
         
         Args:
             audio_path: Path to the audio file
-            response_format: Response format (verbose_json for word-level timestamps)
+            response_format: Response format (verbose_json for timestamps)
+            word_timestamps: Also request word-level timestamps. Segments are
+                             all process_segments needs, and word timings
+                             multiply the response size.
             
         Returns:
             Raw Whisper API response with transcription and timestamps
         """
+        mime_type = mimetypes.guess_type(audio_path)[0] or "application/octet-stream"
+        granularities = ["segment", "word"] if word_timestamps else ["segment"]
+        
         with open(audio_path, "rb") as audio_file:
+            # A real file object lets httpx size the upload from its fileno
+            # (Content-Length) and stream it in chunks
             transcript = self.client.audio.transcriptions.create(
                 model="whisper-1",
-                file=audio_file,
+                file=(os.path.basename(audio_path), audio_file, mime_type),
                 response_format=response_format,
-                timestamp_granularities=["segment", "word"]
+                timestamp_granularities=granularities
             )
         
         return transcript
     
-    def process_segments(self, transcript_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _detect_silences(self, audio_path: str) -> Tuple[float, List[Tuple[float, float]]]:
+        """
+        Measure audio duration and find silences in one ffmpeg pass.
+        
+        Args:
+            audio_path: Path to the audio file
+            
+        Returns:
+            Tuple of (duration in seconds or 0.0 if unknown, list of
+            (start, end) silences)
+        """
+        cmd = [
+            self.ffmpeg_path, "-hide_banner", "-nostats",
+            "-i", audio_path,
+            "-af", f"silencedetect=noise={SILENCE_NOISE_LEVEL}:d={SILENCE_MIN_DURATION}",
+            "-f", "null", "-"
+        ]
+        result = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        if result.returncode != 0:
+            return 0.0, []
+        
+        duration = 0.0
+        match = _DURATION_PATTERN.search(result.stderr)
+        if match:
+            hours, minutes, seconds = match.groups()
+            duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        
+        silences = []
+        silence_start = None
+        for kind, value in _SILENCE_PATTERN.findall(result.stderr):
+            if kind == "start":
+                silence_start = max(float(value), 0.0)
+            elif silence_start is not None:
+                silences.append((silence_start, float(value)))
+                silence_start = None
+        if silence_start is not None:
+            silences.append((silence_start, duration))
+        
+        return duration, silences
+    
+    def _split_audio(self, audio_path: str, output_dir: str) -> List[Tuple[str, float]]:
+        """
+        Split audio at silences into chunks of about TRANSCRIBE_CHUNK_SECONDS.
+        
+        The chunks are cut without re-encoding by a single ffmpeg process.
+        
+        Args:
+            audio_path: Path to the audio file
+            output_dir: Directory for the chunk files
+            
+        Returns:
+            List of (chunk path, start offset in seconds); the original file
+            alone when the audio is short or cannot be measured
+        """
+        duration, silences = self._detect_silences(audio_path)
+        cuts = _chunk_boundaries(duration, silences, TRANSCRIBE_CHUNK_SECONDS)
+        if not cuts:
+            return [(audio_path, 0.0)]
+        
+        suffix = Path(audio_path).suffix
+        segment_list = os.path.join(output_dir, "chunks.csv")
+        cmd = [
+            self.ffmpeg_path, "-y", "-hide_banner", "-v", "error",
+            "-i", audio_path,
+            "-map", "0:a", "-c", "copy",
+            "-f", "segment",
+            "-segment_times", ",".join(f"{cut:.3f}" for cut in cuts),
+            "-segment_list", segment_list,
+            "-segment_list_type", "csv",
+            "-reset_timestamps", "1",
+            os.path.join(output_dir, f"chunk%04d{suffix}")
+        ]
+        result = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Audio splitting failed: {result.stderr.strip()}")
+        
+        # Rows are "file,start,end" with the actual (packet-aligned) times
+        chunks = []
+        with open(segment_list, "r", encoding="utf-8") as f:
+            for line in f:
+                name, start, _end = line.strip().rsplit(",", 2)
+                chunks.append((os.path.join(output_dir, name), float(start)))
+        
+        return chunks
+    
+    def transcribe_chunked(self, audio_path: str) -> List[Dict[str, Any]]:
+        """
+        Transcribe audio as parallel Whisper requests over silence-cut chunks.
+        
+        Args:
+            audio_path: Path to the audio file
+            
+        Returns:
+            List of transcript segments on the full audio's clock
+        """
+        with tempfile.TemporaryDirectory(prefix="aroll_chunks_") as chunk_dir:
+            chunks = self._split_audio(audio_path, chunk_dir)
+            
+            def transcribe_chunk(chunk: Tuple[str, float]) -> List[Dict[str, Any]]:
+                chunk_path, offset = chunk
+                transcript_data = self.transcribe_with_timestamps(chunk_path)
+                return self.process_segments(transcript_data, chunk_offset_sec=offset)
+            
+            if len(chunks) == 1:
+                results = [transcribe_chunk(chunks[0])]
+            else:
+                max_workers = min(TRANSCRIBE_MAX_CONCURRENCY, len(chunks))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    results = list(executor.map(transcribe_chunk, chunks))
+        
+        return [segment for segments in results for segment in segments]
+    
+    def process_segments(
+        self,
+        transcript_data: Dict[str, Any],
+        chunk_offset_sec: float = 0.0
+    ) -> List[Dict[str, Any]]:
         """
         Process Whisper response into clean sentence-level segments.
         
         Args:
             transcript_data: Raw Whisper API response
+            chunk_offset_sec: Start of the transcribed audio chunk within the
+                              full audio, added to every timestamp
             
         Returns:
             List of segments with start_time, end_time, and text
@@ -110,8 +334,8 @@ class ArollTranscriber:
             # Only include non-empty segments
             if text:
                 segments.append({
-                    "start_time": round(start, 2),
-                    "end_time": round(end, 2),
+                    "start_time": round(start + chunk_offset_sec, 2),
+                    "end_time": round(end + chunk_offset_sec, 2),
                     "text": text
                 })
         
@@ -140,13 +364,9 @@ class ArollTranscriber:
         audio_path = self.extract_audio(video_path)
         
         try:
-            # Transcribe with Whisper API
-            transcript_data = self.transcribe_with_timestamps(audio_path)
-            
-            # Process into clean segments
-            segments = self.process_segments(transcript_data)
-            
-            return segments
+            # Transcribe with Whisper API (long audio as parallel chunks)
+            # and process into clean segments
+            return self.transcribe_chunked(audio_path)
         
         finally:
             # Clean up audio file if requested
@@ -183,8 +403,8 @@ class ArollTranscriber:
             "total_duration": segments[-1]["end_time"] if segments else 0.0
         }
         
-        with open(output_json_path, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        with open(output_json_path, "wb") as f:
+            f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
         
         return output_json_path
 
@@ -4,7 +4,6 @@ Example usage of Semantic Matching Module
 Demonstrates matching A-roll segments with B-roll descriptions.
 """
 
-from app.services.matcher import SemanticMatcher
 
 # Example A-roll segments (from transcribe.py output)
 aroll_segments = [
@@ -31,6 +30,9 @@ broll_descriptions = {
 }
 
 if __name__ == "__main__":
+    # Imported here so importing the example data does not load OpenAI/NumPy
+    from app.services.matcher import SemanticMatcher
+    
     # Initialize matcher with default settings
     matcher = SemanticMatcher(
         similarity_threshold=0.72,
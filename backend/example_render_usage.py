@@ -4,8 +4,11 @@ Example usage of Video Rendering Module
 Demonstrates rendering a video from timeline JSON.
 """
 
+import os
 import json
-from app.services.render import VideoRenderer
+import shutil
+import tempfile
+import subprocess
 
 # Example timeline (from timeline.py output)
 timeline = {
@@ -52,7 +55,45 @@ broll_paths = {
     "broll_6": "brolls/broll_6.mp4"
 }
 
+
+def render_with_piped_broll(renderer, timeline, aroll_video_path, broll_paths, broll_id, output_path):
+    """
+    Render with one B-roll streamed through a named FIFO instead of a file.
+    
+    A producer ffmpeg (standing in for any step that generates clips, e.g.
+    trimming a preview) writes NUT, ffmpeg's streamable container, into
+    the FIFO while the render reads it, so the intermediate clip never
+    touches disk. A FIFO can be
+    read only once, so broll_id must appear in a single timeline segment.
+    POSIX only (os.mkfifo).
+    """
+    fifo_dir = tempfile.mkdtemp()
+    fifo_path = os.path.join(fifo_dir, f"{broll_id}.nut")
+    os.mkfifo(fifo_path)
+    
+    # Blocks in open() until the render opens the FIFO for reading
+    producer = subprocess.Popen([
+        renderer.ffmpeg_path, "-v", "error", "-y",
+        "-i", broll_paths[broll_id],
+        "-c", "copy", "-f", "nut", fifo_path
+    ])
+    try:
+        return renderer.render(
+            timeline, aroll_video_path, {**broll_paths, broll_id: fifo_path}, output_path
+        )
+    finally:
+        # The render stops reading after the insertion's duration, so the
+        # producer may still be writing (or, on failure, waiting to open)
+        producer.kill()
+        producer.wait()
+        shutil.rmtree(fifo_dir, ignore_errors=True)
+
+
 if __name__ == "__main__":
+    # Imported here so importing this module (e.g. for the example timeline
+    # or render_with_piped_broll) stays cheap
+    from app.services.render import VideoRenderer
+    
     print("=" * 70)
     print("VIDEO RENDERING EXAMPLE")
     print("=" * 70)
@@ -84,6 +125,18 @@ if __name__ == "__main__":
         print("      broll_paths=broll_paths,")
         print("      output_path='rendered_output.mp4'")
         print("  )")
+        print()
+        print("Several timelines render as concurrent ffmpeg processes:")
+        print("  renderer.render_batch([")
+        print("      {'timeline': timeline, 'aroll_video_path': 'a.mp4',")
+        print("       'broll_paths': broll_paths, 'output_path': 'a_rendered.mp4'},")
+        print("      {'timeline': timeline_2, 'aroll_video_path': 'b.mp4',")
+        print("       'broll_paths': broll_paths, 'output_path': 'b_rendered.mp4'},")
+        print("  ])")
+        print()
+        print("A B-roll produced on the fly can be streamed through a named FIFO:")
+        print("  render_with_piped_broll(renderer, timeline, 'a.mp4', broll_paths,")
+        print("                          'broll_4', 'rendered_output.mp4')")
         
     except ValueError as e:
         print(f"✗ Error: {e}")
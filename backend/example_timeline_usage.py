@@ -4,8 +4,6 @@ Example usage of Timeline Planner Module
 Demonstrates creating a timeline from A-roll segments and B-roll matches.
 """
 
-from app.services.timeline import TimelinePlanner
-
 # Example A-roll segments (from transcribe.py)
 aroll_segments = [
     {"start_time": 0.0, "end_time": 3.5, "text": "Welcome to today's tutorial on smart video editing."},
@@ -46,8 +44,11 @@ broll_matches = [
 ]
 
 if __name__ == "__main__":
+    # Imported here so importing the example data does not load NumPy/Numba
+    from app.services.timeline import TimelinePlanner
+    
     # Initialize planner
-    planner = TimelinePlanner(aroll_video_path="uploads/a_roll_video.mp4")
+    planner = TimelinePlanner(aroll_video_path="uploads/a_roll_video.mp4", debug=True)
     
     print("=" * 80)
     print("TIMELINE PLANNER")
@@ -3,8 +3,19 @@ Simple script to run the FastAPI server locally.
 """
 
 import os
+import platform
 import uvicorn
 
+try:
+    import uvloop  # libuv event loop (installed with uvicorn[standard])
+except ImportError:
+    uvloop = None
+
+try:
+    import httptools  # C HTTP parser (installed with uvicorn[standard])
+except ImportError:
+    httptools = None
+
 if __name__ == "__main__":
     # Check for OpenAI API key
     if not os.getenv("OPENAI_API_KEY"):
@@ -15,18 +26,33 @@ if __name__ == "__main__":
     # Get port from environment or use default
     port = int(os.getenv("PORT", 8000))
     
+    # Auto-reload only for development (DEV=1); it runs a single process,
+    # so WORKERS applies to non-reload runs
+    dev_mode = os.getenv("DEV") == "1"
+    workers = int(os.getenv("WORKERS", 1))
+    loop = "uvloop" if uvloop is not None else "asyncio"
+    http = "httptools" if httptools is not None else "h11"
+    
     print(f"🚀 Starting Smart B-Roll Inserter API server...")
     print(f"   Server: http://localhost:{port}")
     print(f"   Docs: http://localhost:{port}/docs")
     print(f"   Health: http://localhost:{port}/health")
+    print(f"   Mode: {'development (reload)' if dev_mode else f'{workers} worker(s)'}, {loop} + {http}")
     print()
     
+    # Make uvloop the process-wide default too, so event loops created
+    # outside uvicorn's own setup (e.g. by libraries) also run on libuv
+    if uvloop is not None and platform.system() != "Windows":
+        uvloop.install()
+    
     # Run server
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=port,
-        reload=True,
+        reload=dev_mode,
+        workers=None if dev_mode else workers,
+        loop=loop,
+        http=http,
         log_level="info"
     )
-